@@ -0,0 +1,66 @@
+from tablebase import Tablebases
+
+# Centipawns a mate score counts as when comparing against thresholds
+MATE_SCORE = 100000
+
+
+class Adjudicator:
+    """Ends arena games early once their result is no longer in doubt.
+
+    Rules follow the usual engine-testing conventions:
+    - resign: for `resign_moves` consecutive moves of each side, both engines
+      report a score of at least `resign_score` centipawns for the same side;
+    - draw: from move `draw_after` on, both engines report scores within
+      `draw_score` of zero for `draw_moves` consecutive moves each;
+    - tablebases: a position covered by the Syzygy tables in `tablebase_path`
+      is scored with its exact result.
+    Either score rule is switched off by leaving its threshold at None.
+    """
+
+    def __init__(self, resign_score=None, resign_moves=3, draw_score=None, draw_moves=8, draw_after=40,
+                 tablebase_path=None):
+        self.resign_score = resign_score
+        self.resign_moves = resign_moves
+        self.draw_score = draw_score
+        self.draw_moves = draw_moves
+        self.draw_after = draw_after
+        self.tablebases = None
+        if tablebase_path:
+            self.tablebases = Tablebases(tablebase_path)
+
+    @staticmethod
+    def white_score(info):
+        """Score from an engine.play() info dict in White centipawns, or None."""
+        if "score" not in info:
+            return None
+        return info["score"].white().score(mate_score=MATE_SCORE)
+
+    def adjudicate(self, board, scores):
+        """(result, reason) once the game can be decided, otherwise None.
+
+        `scores` holds the White score reported for every move so far (None
+        where the engine gave none), oldest first.
+        """
+        if self.tablebases is not None:
+            result = self.tablebases.result(board)
+            if result:
+                return result, "Tablebase result"
+
+        if self.resign_score is not None:
+            recent = scores[-2 * self.resign_moves:]
+            if len(recent) == 2 * self.resign_moves and None not in recent:
+                if all(score >= self.resign_score for score in recent):
+                    return "1-0", "Black resigns"
+                if all(score <= -self.resign_score for score in recent):
+                    return "0-1", "White resigns"
+
+        if self.draw_score is not None and board.fullmove_number > self.draw_after:
+            recent = scores[-2 * self.draw_moves:]
+            if (len(recent) == 2 * self.draw_moves and None not in recent
+                    and all(abs(score) <= self.draw_score for score in recent)):
+                return "1/2-1/2", "Draw by adjudication"
+        return None
+
+    def close(self):
+        if self.tablebases is not None:
+            self.tablebases.close()
@@ -2,38 +2,34 @@ import os
 import chess
 import chess.engine
 import customtkinter as ctk
+from engine_pool import engine_pool
 from gui import ModernChessGUI
 
-engine_path = os.path.abspath("../engines/Stockfish17.exe")
-
 def display_chess_board(position, fullscreen=False):  # Add fullscreen parameter
     root = ctk.CTk()
     root.title("Chess Analysis")
     if fullscreen:
         root.attributes("-fullscreen", True)  # Set fullscreen if requested
 
-    gui = ModernChessGUI(root, position, engine_path=engine_path)
-
-    def go_back():
-        root.destroy()
-        from Code.main_menu import main_menu
-        main_menu()
-
-    back_button = ctk.CTkButton(gui.main_container, text="Back", command=go_back, corner_radius=10)
-    back_button.pack(side="bottom", pady=10)
-
+    # The analysis board on its own; the toolkit opens it from the main menu instead
+    gui = ModernChessGUI(root, position)
     root.mainloop()
     current_fen = gui.board.fen()
     print("\nFinal FEN:", current_fen)
 
-    if not os.path.exists(engine_path):
-        print(f"Error: Engine not found at {engine_path}")
+    # Analyse with the engine that was selected when the window closed
+    if not os.path.exists(gui.engine_path):
+        print(f"Error: Engine not found at {gui.engine_path}")
         return
 
     try:
-        with chess.engine.SimpleEngine.popen_uci(engine_path) as engine:
+        with engine_pool.engine(gui.engine_path, gui.engine_options) as engine:
             board = chess.Board(current_fen)
             info = engine.analyse(board, chess.engine.Limit(time=2))
             print("Engine Analysis:", info)
     except Exception as e:
         print(f"Error analyzing final position: {str(e)}")
+
+
+if __name__ == "__main__":
+    display_chess_board(chess.STARTING_FEN)
@@ -0,0 +1,315 @@
+"""Headless engine-vs-engine matches and tournaments, for machines without a display.
+
+    python -m Code.arena --engine1 engines/stockfish --engine2 engines/obsidian \
+        --games 100 --time 0.5 --concurrency 8 --pgn match.pgn --summary match.json
+
+    python -m Code.arena --engine1 engines/stockfish --engine2 engines/obsidian --tc 10+0.1 \
+        --resign 3 1000 --draw 40 8 10 --tb /path/to/syzygy
+
+    python -m Code.arena --mode round-robin --engine sf=engines/stockfish \
+        --engine obsidian=engines/obsidian --engine dragon=engines/dragon --sprt 0 5
+
+Any option can also come from a JSON config file passed with --config; values
+given on the command line win over the file.
+
+Every finished game is synced to the PGN file and recorded in a journal
+(default: the PGN path plus .journal). A match that was killed or crashed
+continues where it stopped with:
+
+    python -m Code.arena --resume match.pgn.journal
+"""
+import argparse
+import json
+import math
+import os
+import random
+import signal
+import sys
+import time
+
+# The Code modules import each other by plain name, as they do when the GUI is started from this folder
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from adjudication import Adjudicator
+from match_journal import MatchJournal
+from match_runner import MatchRunner, parse_time_control
+from openings import OpeningSuite
+from tournament import GAUNTLET, ROUND_ROBIN, SPRT, PairingStats, Tournament
+
+DEFAULTS = {
+    "mode": "match",
+    "engine1": None,
+    "engine2": None,
+    "name1": None,
+    "name2": None,
+    "engines": {},  # name -> path, for tournaments
+    "gauntlet": None,
+    "games": 10,
+    "time": 1.0,
+    "tc": None,  # "base+increment" in seconds, instead of a fixed time per move
+    "concurrency": 1,
+    "threads": None,  # UCI Threads for every engine
+    "hash": None,  # UCI Hash in MB for every engine
+    "options": {},  # name -> UCI options, from --config; wins over threads and hash
+    "sprt": None,  # [elo0, elo1]
+    "resign": None,  # [moves, centipawns]
+    "draw": None,  # [after move, moves, centipawns]
+    "tb": None,  # Syzygy directory for tablebase adjudication
+    "openings": None,
+    "shuffle_openings": False,
+    "seed": None,
+    "pgn": "match.pgn",
+    "journal": None,  # default: the PGN path plus .journal
+    "summary": "match.json",
+}
+
+
+def parse_engine(spec):
+    name, separator, path = spec.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"expected NAME=PATH, got {spec!r}")
+    return name, path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run an engine-vs-engine match or tournament without a GUI.")
+    parser.add_argument("--config", help="JSON file with any of the options below")
+    parser.add_argument("--resume", metavar="JOURNAL", help="continue the match recorded in this journal")
+    parser.add_argument("--mode", choices=["match", ROUND_ROBIN, GAUNTLET], help="default match")
+    parser.add_argument("--engine1", help="path to the first engine (match mode)")
+    parser.add_argument("--engine2", help="path to the second engine (match mode)")
+    parser.add_argument("--name1", help="display name of the first engine")
+    parser.add_argument("--name2", help="display name of the second engine")
+    parser.add_argument("--engine", type=parse_engine, action="append", metavar="NAME=PATH",
+                        help="tournament participant, repeat for every engine")
+    parser.add_argument("--gauntlet", help="engine that plays everyone else in gauntlet mode (default the first)")
+    parser.add_argument("--games", type=int, help="games per pairing (default 10)")
+    parser.add_argument("--time", type=float, help="seconds per move (default 1.0)")
+    parser.add_argument("--tc", metavar="BASE+INC",
+                        help="clock time control in seconds, e.g. 10+0.1; replaces --time")
+    parser.add_argument("--concurrency", type=int, help="games played at the same time (default 1)")
+    parser.add_argument("--threads", type=int, help="UCI Threads for every engine (default: the engine's own)")
+    parser.add_argument("--hash", type=int, metavar="MB", help="UCI Hash for every engine (default: the engine's own)")
+    parser.add_argument("--sprt", type=float, nargs=2, metavar=("ELO0", "ELO1"),
+                        help="stop each pairing once an SPRT between these Elo bounds is decided")
+    parser.add_argument("--resign", type=int, nargs=2, metavar=("MOVES", "CP"),
+                        help="adjudicate a win once both engines see CP or more for one side for MOVES moves each")
+    parser.add_argument("--draw", type=int, nargs=3, metavar=("AFTER", "MOVES", "CP"),
+                        help="adjudicate a draw after move AFTER once both engines score within CP of 0 for MOVES moves each")
+    parser.add_argument("--tb", help="Syzygy tablebase directory used to adjudicate endgames")
+    parser.add_argument("--openings", help="EPD or PGN opening suite; each opening is played with both colours")
+    parser.add_argument("--shuffle-openings", action="store_true", default=None, help="play the openings in random order")
+    parser.add_argument("--seed", type=int, help="random seed for --shuffle-openings")
+    parser.add_argument("--pgn", help="PGN output file (default match.pgn)")
+    parser.add_argument("--journal", help="journal file used to resume the match (default PGN path + .journal)")
+    parser.add_argument("--summary", help="JSON summary output file (default match.json)")
+    args = parser.parse_args(argv)
+
+    if args.resume:
+        # Everything else comes from the journal, so the remaining games match the ones already played
+        return None, MatchJournal.load(args.resume)
+
+    settings = dict(DEFAULTS)
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            settings.update(json.load(f))
+    if args.engine:
+        args.engine = dict(args.engine)
+        settings["engines"] = args.engine
+    settings.update({
+        key: value for key, value in vars(args).items()
+        if value is not None and key not in ("config", "engine")
+    })
+
+    if settings["mode"] == "match":
+        if not settings["engine1"] or not settings["engine2"]:
+            parser.error("both --engine1 and --engine2 are required (on the command line or in --config)")
+        for number in ("1", "2"):
+            if not settings["name" + number]:
+                settings["name" + number] = os.path.splitext(os.path.basename(settings["engine" + number]))[0]
+    elif len(settings["engines"]) < 2:
+        parser.error("tournaments need at least two --engine NAME=PATH entries")
+    if settings["tc"]:
+        try:
+            parse_time_control(settings["tc"])
+        except ValueError as e:
+            parser.error(str(e))
+    if settings["shuffle_openings"] and settings["seed"] is None:
+        # Fixed here so a resumed match plays the openings in the same order
+        settings["seed"] = random.randrange(2 ** 32)
+    settings["journal"] = settings["journal"] or settings["pgn"] + ".journal"
+    return settings, None
+
+
+def main(argv=None):
+    settings, journal = parse_args(argv)
+    if journal is None:
+        journal = MatchJournal(settings["journal"], settings, settings["pgn"])
+    else:
+        settings = dict(DEFAULTS, **journal.settings)
+        print(f"Resuming after {journal.games} games", flush=True)
+    sprt = SPRT(*settings["sprt"]) if settings["sprt"] else None
+    time_control = parse_time_control(settings["tc"]) if settings["tc"] else None
+    adjudicator = None
+    if settings["resign"] or settings["draw"] or settings["tb"]:
+        resign_moves, resign_score = settings["resign"] or (3, None)
+        draw_after, draw_moves, draw_score = settings["draw"] or (40, 8, None)
+        adjudicator = Adjudicator(
+            resign_score=resign_score, resign_moves=resign_moves,
+            draw_score=draw_score, draw_moves=draw_moves, draw_after=draw_after,
+            tablebase_path=settings["tb"]
+        )
+    options = {}
+    names = [settings["name1"], settings["name2"]] if settings["mode"] == "match" else list(settings["engines"])
+    for name in names:
+        options[name] = {
+            option: settings[key] for option, key in (("Threads", "threads"), ("Hash", "hash")) if settings[key]
+        }
+        options[name].update(settings["options"].get(name, {}))
+    openings = None
+    if settings["openings"]:
+        openings = OpeningSuite(settings["openings"], shuffle=settings["shuffle_openings"], seed=settings["seed"])
+    interrupted = []
+
+    journal.open()
+
+    def on_tournament_game_finished(stats, game_num, game):
+        journal.record(stats.engine1, stats.engine2, game_num, stats.points[game_num], game)
+        print(f"Game {game_num}: {game.headers['White']} - {game.headers['Black']} {game.headers['Result']}  "
+              f"[{stats.summary()}]", flush=True)
+
+    if settings["mode"] == "match":
+        name1, name2 = settings["name1"], settings["name2"]
+        stats = PairingStats(name1, name2)
+        completed = journal.completed(name1, name2)
+        for game_num, points in completed.items():
+            stats.add(game_num, points)
+
+        def on_game_finished(game_num, game):
+            stats.add(game_num, MatchRunner.engine1_points(game_num, game))
+            if sprt and sprt.decision(stats):
+                runner.stop()
+            journal.record(name1, name2, game_num, stats.points[game_num], game)
+            score = runner.score
+            print(
+                f"Game {game_num}: {game.headers['White']} - {game.headers['Black']} {game.headers['Result']}  "
+                f"[{name1} {score['engine1']}, {name2} {score['engine2']}, draws {score['draws']}]",
+                flush=True
+            )
+
+        runner = MatchRunner(
+            name1, settings["engine1"],
+            name2, settings["engine2"],
+            num_games=settings["games"],
+            time_per_move=settings["time"],
+            concurrency=settings["concurrency"],
+            time_control=time_control,
+            adjudicator=adjudicator,
+            options=options,
+            openings=openings,
+            on_game_finished=on_game_finished,
+            completed=completed
+        )
+        if sprt and sprt.decision(stats):
+            runner.stop()  # Decided before the match was interrupted
+    else:
+        stats = None
+        runner = Tournament(
+            settings["engines"],
+            mode=settings["mode"],
+            gauntlet_engine=settings["gauntlet"],
+            games_per_pairing=settings["games"],
+            time_per_move=settings["time"],
+            concurrency=settings["concurrency"],
+            sprt=sprt,
+            time_control=time_control,
+            adjudicator=adjudicator,
+            options=options,
+            openings=openings,
+            on_game_finished=on_tournament_game_finished,
+            completed={pairing: dict(points) for pairing, points in journal.results.items()}
+        )
+
+    def on_sigterm(signum, frame):
+        interrupted.append(signum)
+        runner.stop()
+
+    # Let `kill` end a nohup'd match cleanly: games in flight stop and the summary is still written
+    signal.signal(signal.SIGTERM, on_sigterm)
+
+    started = time.monotonic()
+    status = "completed"
+    try:
+        runner.run()
+        if interrupted:
+            status = "stopped"
+    except KeyboardInterrupt:
+        status = "stopped"
+    except Exception as e:
+        status = f"error: {str(e)}"
+    finally:
+        journal.close()
+        if adjudicator:
+            adjudicator.close()
+
+    summary = {
+        "status": status,
+        "mode": settings["mode"],
+        "games_played": journal.games,
+        "games_per_pairing": settings["games"],
+        "time_per_move": None if time_control else settings["time"],
+        "time_control": settings["tc"],
+        "adjudication": {"resign": settings["resign"], "draw": settings["draw"], "tb": settings["tb"]},
+        "concurrency": settings["concurrency"],
+        "options": options,
+        "openings": settings["openings"],
+        "stats": runner.stats,
+        "wall_time": time.monotonic() - started,
+    }
+    if stats is not None:
+        summary["engine1"] = {"name": settings["name1"], "path": settings["engine1"]}
+        summary["engine2"] = {"name": settings["name2"], "path": settings["engine2"]}
+        summary["score"] = runner.score
+        pairings = [stats]
+    else:
+        summary["engines"] = settings["engines"]
+        summary["standings"] = [
+            {"name": name, "points": points, "games": games} for name, points, games in runner.standings()
+        ]
+        summary["crosstable"] = runner.crosstable().splitlines()
+        pairings = list(runner.results.values())
+
+    summary["pairings"] = []
+    for pairing in pairings:
+        elo, error = pairing.elo()
+        losses, draws, wins = pairing.trinomial()
+        entry = {
+            "engine1": pairing.engine1,
+            "engine2": pairing.engine2,
+            "wins": wins,
+            "draws": draws,
+            "losses": losses,
+            "pentanomial": pairing.pentanomial(),
+            "elo": elo if math.isfinite(elo) else None,
+            "elo_error": error if math.isfinite(error) else None,
+        }
+        if sprt:
+            entry["sprt"] = {
+                "elo0": sprt.elo0,
+                "elo1": sprt.elo1,
+                "llr": pairing.llr(sprt.elo0, sprt.elo1),
+                "decision": sprt.decision(pairing),
+            }
+        summary["pairings"].append(entry)
+
+    with open(settings["summary"], "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    if stats is None:
+        print(runner.report())
+    print(f"{settings['mode'].capitalize()} {status}. {runner.stats_summary()}")
+    return 0 if status == "completed" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,39 +1,92 @@
 import os
-import time
+import random
+from datetime import datetime
+
 import chess
-import chess.engine
 import chess.pgn
 import customtkinter as ctk
-from datetime import datetime
 import threading
 import queue
+from collections import namedtuple
+from tkinter import filedialog
+
+from adjudication import Adjudicator
+from board_canvas import BoardCanvas
+from engine_registry import engine_registry
+from export_dialog import BulkExportDialog
+from match_journal import MatchJournal
+from match_runner import MatchRunner, format_time_control, parse_time_control
+from openings import OpeningSuite
+from pgn_export import game_chunks
+from tablebase import TABLEBASE_DIR, tablebases
+from tournament import GAUNTLET, ROUND_ROBIN, SPRT, PairingStats, Tournament, format_elo
+
+MATCH_MODE = "Match"
+ROUND_ROBIN_MODE = "Round Robin"
+GAUNTLET_MODE = "Gauntlet"
+
+# Adjudication used when it is switched on: resign after 3 moves at 10 pawns or more,
+# draw from move 40 on after 8 moves within 0.1 pawns of equality, and tablebase results
+RESIGN_ADJUDICATION = [3, 1000]
+DRAW_ADJUDICATION = [40, 8, 10]
+
+# Journal modes, shared with the command-line arena so either can resume the other's matches
+JOURNAL_MODES = {MATCH_MODE: "match", ROUND_ROBIN_MODE: ROUND_ROBIN, GAUNTLET_MODE: GAUNTLET}
+
+# Every match is saved here as it is played
+MATCHES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "matches")
+
+# Milliseconds between applying the match thread's events; everything queued in between is drawn once
+REFRESH_INTERVAL = 100
+
+# Events the match thread hands to the Tk thread. They only carry values the thread will not
+# change afterwards; `game` identifies a game and is never read from the Tk side.
+MoveEvent = namedtuple("MoveEvent", "game players fen san")  # san of the last move, None before any
+GameFinishedEvent = namedtuple("GameFinishedEvent", "game")
+ScoreEvent = namedtuple("ScoreEvent", "text")
+MatchFinishedEvent = namedtuple("MatchFinishedEvent", "status report")
+
+# Elo hypotheses tested when SPRT is switched on
+SPRT_ELO0 = 0.0
+SPRT_ELO1 = 5.0
 
 
 class BattleArena:
-    def __init__(self, root):
+    def __init__(self, root, on_back=None):
         self.root = root
-        self.engines = {
-            "Stockfish": "../engines/Stockfish17.exe",
-            "Komodo Dragon": "../engines/KomodoDragon3.3.exe",
-            "Houdini": "../engines/Houdini.exe",
-            "Obsidian": "../engines/Obsidian.exe",
-        }
+        self.on_back = on_back or root.destroy
+        self.engines = engine_registry.paths()
         self.engine1 = None
         self.engine2 = None
         self.board = chess.Board()
+        self.board_fen = None  # latest position of the followed game, drawn on the next tick
         self.game_history = []
-        self.current_game = None
+        self.watched_moves = None  # (game, first mover, first move number, SAN list) of the followed game
+        self.watched_players = None
+        self.shown_game = None  # game whose moves are in the move list
+        self.shown_moves = 0
         self.is_match_running = False
         self.match_thread = None
-        self.move_queue = queue.Queue()
+        self.events = queue.Queue()  # filled by the match thread, drained by apply_events
         self.selected_square = None
         self.display_update_timer = None
 
         # Match settings
         self.num_games = 10
         self.time_per_move = 1.0  # seconds
-        self.current_game_num = 0
+        self.time_control = None  # (base, increment) seconds when playing with clocks
+        self.concurrency = 1  # games played at the same time
+        self.finished_games = set()  # games seen finishing, by identity
+        self.match_runner = None  # MatchRunner, or Tournament outside of match mode
+        self.mode = MATCH_MODE
+        self.sprt = None
+        self.pairing_stats = None
+        self.openings_path = None
+        self.openings = None
+        self.journal = None  # MatchJournal of the running match
+        self.adjudicator = None
         self.score = {"engine1": 0, "engine2": 0, "draws": 0}
+        self.engine_names = None  # (engine 1, engine 2) of the running match
 
         self.create_gui()
         self.update_board()
@@ -65,7 +118,8 @@ class BattleArena:
             font=ctk.CTkFont(family="Segoe UI", size=14, weight="bold")
         ).pack(pady=(0, 5))
 
-        self.engine1_var = ctk.StringVar(value="Stockfish")
+        names = list(self.engines)
+        self.engine1_var = ctk.StringVar(value=names[0])
         self.engine1_menu = ctk.CTkOptionMenu(
             engine1_frame,
             values=list(self.engines.keys()),
@@ -84,7 +138,7 @@ class BattleArena:
             font=ctk.CTkFont(family="Segoe UI", size=14, weight="bold")
         ).pack(pady=(0, 5))
 
-        self.engine2_var = ctk.StringVar(value="Komodo Dragon")
+        self.engine2_var = ctk.StringVar(value=names[1] if len(names) > 1 else names[0])
         self.engine2_menu = ctk.CTkOptionMenu(
             engine2_frame,
             values=list(self.engines.keys()),
@@ -93,6 +147,64 @@ class BattleArena:
         )
         self.engine2_menu.pack()
 
+        # Match or tournament mode; in a gauntlet Engine 1 plays everyone else
+        mode_frame = ctk.CTkFrame(self.setup_frame, fg_color="transparent")
+        mode_frame.pack(side="left", fill="x", expand=True, padx=20, pady=10)
+
+        ctk.CTkLabel(
+            mode_frame,
+            text="Mode:",
+            font=ctk.CTkFont(family="Segoe UI", size=14, weight="bold")
+        ).pack(pady=(0, 5))
+
+        self.mode_var = ctk.StringVar(value=MATCH_MODE)
+        self.mode_menu = ctk.CTkOptionMenu(
+            mode_frame,
+            values=[MATCH_MODE, ROUND_ROBIN_MODE, GAUNTLET_MODE],
+            variable=self.mode_var,
+            width=200
+        )
+        self.mode_menu.pack()
+
+        self.sprt_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            mode_frame,
+            text=f"SPRT [{SPRT_ELO0:g}, {SPRT_ELO1:g}]",
+            variable=self.sprt_var
+        ).pack(pady=(5, 0))
+
+        self.adjudicate_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            mode_frame,
+            text="Adjudicate resigns/draws",
+            variable=self.adjudicate_var
+        ).pack(pady=(5, 0))
+
+        # Opening suite: each opening is played twice with colours reversed
+        openings_frame = ctk.CTkFrame(self.setup_frame, fg_color="transparent")
+        openings_frame.pack(side="left", fill="x", expand=True, padx=20, pady=10)
+
+        ctk.CTkButton(
+            openings_frame,
+            text="Openings...",
+            width=120,
+            command=self.choose_openings
+        ).pack(pady=(0, 5))
+
+        self.openings_label = ctk.CTkLabel(
+            openings_frame,
+            text="Start position",
+            font=ctk.CTkFont(family="Segoe UI", size=12)
+        )
+        self.openings_label.pack()
+
+        self.shuffle_openings_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            openings_frame,
+            text="Shuffle openings",
+            variable=self.shuffle_openings_var
+        ).pack(pady=(5, 0))
+
         # Match settings
         settings_frame = ctk.CTkFrame(self.main_container, corner_radius=10)
         settings_frame.pack(fill="x", pady=10)
@@ -121,7 +233,7 @@ class BattleArena:
 
         ctk.CTkLabel(
             time_frame,
-            text="Time per Move (seconds):",
+            text="Time (s/move or base+inc):",
             font=ctk.CTkFont(family="Segoe UI", size=14)
         ).pack(side="left", padx=(0, 10))
 
@@ -133,6 +245,24 @@ class BattleArena:
         )
         time_entry.pack(side="left")
 
+        # Games played in parallel, each with its own pair of engines
+        concurrency_frame = ctk.CTkFrame(settings_frame, fg_color="transparent")
+        concurrency_frame.pack(side="right", fill="x", expand=True, padx=20, pady=10)
+
+        ctk.CTkLabel(
+            concurrency_frame,
+            text="Concurrent Games:",
+            font=ctk.CTkFont(family="Segoe UI", size=14)
+        ).pack(side="left", padx=(0, 10))
+
+        self.concurrency_var = ctk.StringVar(value="1")
+        concurrency_entry = ctk.CTkEntry(
+            concurrency_frame,
+            width=60,
+            textvariable=self.concurrency_var
+        )
+        concurrency_entry.pack(side="left")
+
         # Game display - split into board and info sections
         display_frame = ctk.CTkFrame(self.main_container, corner_radius=10)
         display_frame.pack(fill="both", expand=True, pady=10)
@@ -149,6 +279,7 @@ class BattleArena:
             highlightthickness=0
         )
         self.canvas.pack(fill="both", expand=True, padx=10, pady=10)
+        self.board_view = BoardCanvas(self.canvas, square_size=50, show_coordinates=False)
 
         # Game info and history
         info_frame = ctk.CTkFrame(display_frame, corner_radius=0, width=300)
@@ -188,8 +319,8 @@ class BattleArena:
             wrap="word"
         )
         self.score_text.pack(fill="x", padx=10, pady=(0, 10))
-        self.update_score_display()
-        self.score_text.configure(state="disabled")
+        self.engine_names = (self.engine1_var.get(), self.engine2_var.get())
+        self.show_score(self.score_summary())
 
         # Move history
         history_label = ctk.CTkLabel(
@@ -231,11 +362,27 @@ class BattleArena:
         )
         self.stop_button.pack(side="left", padx=20, pady=10)
 
-        def go_back():
-            self.root.destroy()
-            from Code.main_menu import main_menu
-            main_menu()
+        self.resume_button = ctk.CTkButton(
+            control_frame,
+            text="Resume Match",
+            font=ctk.CTkFont(family="Segoe UI", size=16),
+            height=40,
+            width=150,
+            command=self.resume_match
+        )
+        self.resume_button.pack(side="left", padx=20, pady=10)
+
+        self.export_button = ctk.CTkButton(
+            control_frame,
+            text="Export Games",
+            font=ctk.CTkFont(family="Segoe UI", size=16),
+            height=40,
+            width=150,
+            command=self.export_games
+        )
+        self.export_button.pack(side="left", padx=20, pady=10)
 
+        # A running match keeps playing while the user is elsewhere
         back_button = ctk.CTkButton(
             self.main_container,
             text="Back",
@@ -243,35 +390,81 @@ class BattleArena:
             height=40,
             width=150,
             corner_radius=10,
-            command=go_back
+            command=self.on_back
         )
         back_button.pack(side="bottom", pady=10)
 
         self.start_display_updates()
 
     def start_display_updates(self):
-        def update_handler():
-            if self.is_match_running:
-                try:
-                    while not self.move_queue.empty():
-                        update = self.move_queue.get_nowait()
-                        if update == "board":
-                            self.update_board()
-                except queue.Empty:
-                    pass
-                self.root.after(100, update_handler)
-
-        self.root.after(100, update_handler)
-
-    def update_score_display(self):
-        engine1_name = self.engine1_var.get()
-        engine2_name = self.engine2_var.get()
-
+        self.root.after(REFRESH_INTERVAL, self.apply_events)
+
+    def apply_events(self):
+        # Runs on the Tk thread: apply everything the match thread published since the
+        # last tick, then redraw once, however many moves arrived in between
+        board_changed = False
+        score = finished = None
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(event, MoveEvent):
+                board_changed = self.follow_move(event) or board_changed
+            elif isinstance(event, GameFinishedEvent):
+                self.finished_games.add(event.game)
+            elif isinstance(event, ScoreEvent):
+                score = event.text
+            elif isinstance(event, MatchFinishedEvent):
+                finished = event
+
+        if board_changed:
+            self.board = chess.Board(self.board_fen)
+            self.update_board()
+        if score is not None:
+            self.show_score(score)
+        if finished is not None:
+            self.finish_match(finished)
+        self.root.after(REFRESH_INTERVAL, self.apply_events)
+
+    def follow_move(self, event):
+        """Apply a MoveEvent to the followed game; False if it belongs to another game."""
+        followed = self.watched_moves[0] if self.watched_moves else None
+        if event.game is not followed:
+            # With several games running at once, follow one game until it finishes
+            # (or its pairing is over, since a stopped game never finishes)
+            if (followed is not None and followed not in self.finished_games
+                    and event.players == self.watched_players):
+                return False
+            fields = event.fen.split()
+            turn = chess.WHITE if fields[1] == "w" else chess.BLACK
+            self.watched_moves = (event.game, turn, int(fields[5]), [])
+            self.watched_players = event.players
+        elif event.san is not None:
+            self.watched_moves[3].append(event.san)
+        self.board_fen = event.fen
+        return True
+
+    def score_summary(self):
+        # Called on the match thread while a match runs, which owns every value read here
+        engine1_name, engine2_name = self.engine_names
+
+        if isinstance(self.match_runner, Tournament):
+            lines = [f"{name}: {points:g}/{games}" for name, points, games in self.match_runner.standings()]
+            score_info = "\n".join(lines)
+        else:
+            score_info = f"{engine1_name}: {self.score['engine1']}\n"
+            score_info += f"{engine2_name}: {self.score['engine2']}\n"
+            score_info += f"Draws: {self.score['draws']}"
+        if self.pairing_stats and self.pairing_stats.games:
+            score_info += f"\n{self.pairing_stats.engine1} Elo: {format_elo(*self.pairing_stats.elo())}"
+            if self.sprt:
+                score_info += f"\n{self.sprt.summary(self.pairing_stats)}"
+        return score_info
+
+    def show_score(self, score_info):
         self.score_text.configure(state="normal")
         self.score_text.delete("1.0", "end")
-        score_info = f"{engine1_name}: {self.score['engine1']}\n"
-        score_info += f"{engine2_name}: {self.score['engine2']}\n"
-        score_info += f"Draws: {self.score['draws']}"
         self.score_text.insert("1.0", score_info)
         self.score_text.configure(state="disabled")
 
@@ -282,174 +475,331 @@ class BattleArena:
         self.status_text.configure(state="disabled")
 
     def update_move_history(self):
-        self.move_text.delete("1.0", "end")
-
-        if self.current_game:
-            # Format the moves in a readable way
-            moves = []
-            board = chess.Board()
-            i = 0
-
-            for move in self.current_game.mainline_moves():
-                if i % 2 == 0:
-                    move_num = (i // 2) + 1
-                    moves.append(f"{move_num}. {board.san(move)}")
-                else:
-                    moves[-1] += f" {board.san(move)}"
-                board.push(move)
-                i += 1
-
-            self.move_text.insert("1.0", "\n".join(moves))
+        watched = self.watched_moves
+        if watched is None:
+            return
+        game, first_turn, first_number, sans = watched
+        if game is not self.shown_game:
+            self.move_text.delete("1.0", "end")
+            self.shown_game = game
+            self.shown_moves = 0
+
+        # Append only the moves played since the last update, one full move per line
+        offset = 0 if first_turn == chess.WHITE else 1
+        for ply in range(self.shown_moves, len(sans)):
+            number = first_number + (ply + offset) // 2
+            if (ply + offset) % 2 == 0:
+                text = f"{number}. {sans[ply]}"
+                if ply > 0:
+                    text = "\n" + text
+            elif ply == 0:
+                text = f"{number}... {sans[ply]}"
+            else:
+                text = f" {sans[ply]}"
+            self.move_text.insert("end", text)
+        self.shown_moves = len(sans)
 
     def draw_board(self):
-        self.canvas.delete("all")
-
-        # Get canvas dimensions
-        width = self.canvas.winfo_width()
-        height = self.canvas.winfo_height()
-
-        # Ensure minimum size
-        width = max(width, 400)
-        height = max(height, 400)
-
-        # Calculate square size
-        square_size = min(width, height) // 8
-
-        # Draw squares
-        for row in range(8):
-            for col in range(8):
-                x1 = col * square_size
-                y1 = row * square_size
-                x2 = x1 + square_size
-                y2 = y1 + square_size
-
-                # Light or dark square
-                color = "#e9edcc" if (row + col) % 2 == 0 else "#779556"
-
-                self.canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    fill=color,
-                    outline=""
-                )
-
-                # Draw piece if present
-                square = chess.square(col, 7 - row)
-                piece = self.board.piece_at(square)
-
-                if piece:
-                    piece_symbol = self.get_piece_symbol(piece)
-                    text_color = "#ffffff" if piece.color == chess.WHITE else "#000000"
-
-                    self.canvas.create_text(
-                        x1 + square_size // 2,
-                        y1 + square_size // 2,
-                        text=piece_symbol,
-                        font=('Segoe UI', int(square_size * 0.6), 'bold'),
-                        fill=text_color
-                    )
-
-    def get_piece_symbol(self, piece):
-        symbols = {
-            'P': '♙', 'N': '♘', 'B': '♗', 'R': '♖', 'Q': '♕', 'K': '♔',
-            'p': '♟', 'n': '♞', 'b': '♝', 'r': '♜', 'q': '♛', 'k': '♚'
-        }
-        return symbols.get(piece.symbol(), '')
+        # Fit the board to the canvas, never smaller than 400px
+        width = max(self.canvas.winfo_width(), 400)
+        height = max(self.canvas.winfo_height(), 400)
+        self.board_view.resize(min(width, height) // 8)
+        self.board_view.update(self.board)
 
     def update_board(self):
         self.draw_board()
         self.update_move_history()
 
-    def run_match(self):
-        engine1_name = self.engine1_var.get()
-        engine2_name = self.engine2_var.get()
-        engine1_path = self.engines[engine1_name]
-        engine2_path = self.engines[engine2_name]
-
+    def run_match(self, runner, journal, adjudicator):
+        # Match thread: never touches Tk, everything for the screen goes through self.events.
+        # It only closes what it was started with, never whatever self.* holds by then.
+        error = None
         try:
-            for game_num in range(1, self.num_games + 1):
-                if not self.is_match_running:
-                    break
-
-                self.current_game_num = game_num
-                self.board = chess.Board()
-                self.current_game = chess.pgn.Game()
-
-                # Set up game headers
-                self.current_game.headers["Event"] = "Engine Battle"
-                self.current_game.headers["Date"] = datetime.now().strftime("%Y.%m.%d")
-                self.current_game.headers["White"] = engine1_name if game_num % 2 == 1 else engine2_name
-                self.current_game.headers["Black"] = engine2_name if game_num % 2 == 1 else engine1_name
-                self.current_game.headers["Round"] = str(game_num)
-
-                engine1 = chess.engine.SimpleEngine.popen_uci(
-                    engine1_path if game_num % 2 == 1 else engine2_path
-                )
-                engine2 = chess.engine.SimpleEngine.popen_uci(
-                    engine2_path if game_num % 2 == 1 else engine1_path
-                )
-
-                try:
-                    node = self.current_game
-
-                    # Initial board update
-                    self.move_queue.put("board")
-
-                    while not self.board.is_game_over() and self.is_match_running:
-                        engine = engine1 if self.board.turn == chess.WHITE else engine2
-                        result = engine.play(
-                            self.board,
-                            chess.engine.Limit(time=self.time_per_move)
-                        )
-                        self.board.push(result.move)
-                        node = node.add_variation(result.move)
-                        self.move_queue.put("board")
-
-                        # Small delay to allow GUI updates
-                        time.sleep(0.1)
-
-                finally:
-                    engine1.quit()
-                    engine2.quit()
-
-                # Update score after game ends
-                if self.board.is_checkmate():
-                    winner = "engine1" if (self.board.turn == chess.BLACK) == (game_num % 2 == 1) else "engine2"
-                    self.score[winner] += 1
-                else:
-                    self.score["draws"] += 1
-
-                self.move_queue.put("board")  # Final position update
-                self.update_score_display()
-
+            runner.run()
         except Exception as e:
-            self.update_status(f"Error: {str(e)}")
+            error = f"Error: {str(e)}"
         finally:
-            self.is_match_running = False
-            self.stop_button.configure(state="disabled")
-            self.start_button.configure(state="normal")
-            self.update_status("Match completed.")
+            journal.close()
+            if adjudicator:
+                adjudicator.close()
+            if isinstance(runner, Tournament):
+                status = f"Tournament completed.\n{runner.stats_summary()}"
+                self.events.put(MatchFinishedEvent(error or status, runner.report()))
+            else:
+                status = f"Match completed.\n{runner.stats_summary()}"
+                self.events.put(MatchFinishedEvent(error or status, None))
+
+    def finish_match(self, event):
+        self.is_match_running = False
+        self.stop_button.configure(state="disabled")
+        self.start_button.configure(state="normal")
+        self.update_status(event.status)
+        if event.report is not None:
+            self.show_tournament_report(event.report)
+
+    def create_match_runner(self):
+        engine1_name, engine2_name = self.engine_names
+        completed = self.journal.completed(engine1_name, engine2_name)
+        self.match_runner = MatchRunner(
+            engine1_name, self.journal.settings["engine1"],
+            engine2_name, self.journal.settings["engine2"],
+            num_games=self.num_games,
+            time_per_move=self.time_per_move,
+            concurrency=self.concurrency,
+            time_control=self.time_control,
+            adjudicator=self.adjudicator,
+            options=self.journal.settings.get("options"),
+            openings=self.openings,
+            on_move=self.on_match_move,
+            on_game_finished=self.on_game_finished,
+            completed=completed
+        )
+        self.score = self.match_runner.score
+        self.game_history = self.match_runner.games
+        self.pairing_stats = PairingStats(engine1_name, engine2_name)
+        for game_num, points in completed.items():
+            self.pairing_stats.add(game_num, points)
+        if self.sprt and self.sprt.decision(self.pairing_stats):
+            self.match_runner.stop()  # Decided before the match was interrupted
+
+    def create_tournament(self):
+        self.match_runner = Tournament(
+            self.journal.settings["engines"],
+            mode=GAUNTLET if self.mode == GAUNTLET_MODE else ROUND_ROBIN,
+            gauntlet_engine=self.journal.settings["gauntlet"],
+            games_per_pairing=self.num_games,
+            time_per_move=self.time_per_move,
+            concurrency=self.concurrency,
+            sprt=self.sprt,
+            time_control=self.time_control,
+            adjudicator=self.adjudicator,
+            options=self.journal.settings.get("options"),
+            openings=self.openings,
+            on_move=self.on_match_move,
+            on_game_finished=self.on_tournament_game_finished,
+            completed={pairing: dict(points) for pairing, points in self.journal.results.items()}
+        )
+        self.game_history = self.match_runner.games
+
+    def choose_openings(self):
+        path = filedialog.askopenfilename(
+            parent=self.root,
+            title="Opening suite",
+            filetypes=[("Opening suites", "*.epd *.pgn"), ("All files", "*.*")]
+        )
+        self.openings_path = path or None
+        self.openings_label.configure(text=os.path.basename(path) if path else "Start position")
+
+    def show_tournament_report(self, report):
+        # The crosstable replaces the move list once the tournament is over
+        self.watched_moves = None
+        self.shown_game = None
+        self.move_text.delete("1.0", "end")
+        self.move_text.insert("1.0", report)
+
+    def on_match_move(self, game_num, board, game):
+        # Called on the thread playing this game, which owns `board` and `game` until the next move
+        san = None
+        if board.move_stack:
+            # Work out the SAN of the new move once, instead of replaying the game on the Tk side
+            before = board.copy(stack=1)
+            move = before.pop()
+            san = before.san(move)
+        players = frozenset((game.headers["White"], game.headers["Black"]))
+        self.events.put(MoveEvent(game, players, board.fen(), san))
+
+    def on_game_finished(self, game_num, game):
+        self.pairing_stats.add(game_num, MatchRunner.engine1_points(game_num, game))
+        self.journal.record(
+            self.pairing_stats.engine1, self.pairing_stats.engine2,
+            game_num, self.pairing_stats.points[game_num], game
+        )
+        if self.sprt and self.sprt.decision(self.pairing_stats):
+            self.match_runner.stop()
+        self.events.put(GameFinishedEvent(game))
+        self.events.put(ScoreEvent(self.score_summary()))
+
+    def on_tournament_game_finished(self, stats, game_num, game):
+        self.pairing_stats = stats
+        self.journal.record(stats.engine1, stats.engine2, game_num, stats.points[game_num], game)
+        self.events.put(GameFinishedEvent(game))
+        self.events.put(ScoreEvent(self.score_summary()))
+
+    def resume_match(self):
+        if self.is_match_running:
+            return
+        path = filedialog.askopenfilename(
+            parent=self.root,
+            title="Resume match",
+            initialdir=MATCHES_DIR if os.path.isdir(MATCHES_DIR) else None,
+            filetypes=[("Match journals", "*.journal"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            journal = MatchJournal.load(path)
+            settings = journal.settings
+            mode = {value: key for key, value in JOURNAL_MODES.items()}[settings["mode"]]
+        except (OSError, ValueError, KeyError) as e:
+            self.update_status(f"Cannot resume: {str(e)}")
+            return
+
+        # Show the journal's settings, then start exactly as if they had been entered
+        self.mode_var.set(mode)
+        if mode == MATCH_MODE:
+            self.engine1_var.set(settings["name1"])
+            self.engine2_var.set(settings["name2"])
+        elif settings["gauntlet"]:
+            self.engine1_var.set(settings["gauntlet"])
+        self.games_var.set(str(settings["games"]))
+        self.time_var.set(settings.get("tc") or str(settings["time"]))
+        self.concurrency_var.set(str(settings["concurrency"]))
+        self.sprt_var.set(bool(settings["sprt"]))
+        self.adjudicate_var.set(bool(settings.get("resign") or settings.get("draw") or settings.get("tb")))
+        self.openings_path = settings["openings"]
+        self.openings_label.configure(
+            text=os.path.basename(self.openings_path) if self.openings_path else "Start position"
+        )
+        self.shuffle_openings_var.set(settings["shuffle_openings"])
+        self.start_match(journal)
+
+    @staticmethod
+    def create_adjudicator(adjudication):
+        # Same reading of the journal's "resign", "draw" and "tb" as the command-line arena
+        if not (adjudication["resign"] or adjudication["draw"] or adjudication["tb"]):
+            return None
+        resign_moves, resign_score = adjudication["resign"] or (3, None)
+        draw_after, draw_moves, draw_score = adjudication["draw"] or (40, 8, None)
+        return Adjudicator(
+            resign_score=resign_score, resign_moves=resign_moves,
+            draw_score=draw_score, draw_moves=draw_moves, draw_after=draw_after,
+            tablebase_path=adjudication["tb"]
+        )
 
-    def start_match(self):
+    def new_journal(self, seed, adjudication):
+        engines = self.engines
+        if self.mode == MATCH_MODE:
+            engines = {name: self.engines[name] for name in (self.engine1_var.get(), self.engine2_var.get())}
+        settings = {
+            "mode": JOURNAL_MODES[self.mode],
+            "engine1": self.engines[self.engine1_var.get()],
+            "engine2": self.engines[self.engine2_var.get()],
+            "name1": self.engine1_var.get(),
+            "name2": self.engine2_var.get(),
+            "engines": engines,
+            # Only the side to move searches, so the cores are shared between the games in parallel
+            "options": {
+                name: engine_registry.options(name, threads=max(1, engine_registry.threads // self.concurrency))
+                for name in engines
+            },
+            "gauntlet": self.engine1_var.get() if self.mode == GAUNTLET_MODE else None,
+            "games": self.num_games,
+            "time": self.time_per_move,
+            "tc": format_time_control(self.time_control) if self.time_control else None,
+            "concurrency": self.concurrency,
+            "sprt": [self.sprt.elo0, self.sprt.elo1] if self.sprt else None,
+            "resign": adjudication["resign"],
+            "draw": adjudication["draw"],
+            "tb": adjudication["tb"],
+            "openings": self.openings_path,
+            "shuffle_openings": self.shuffle_openings_var.get(),
+            "seed": seed,
+        }
+        os.makedirs(MATCHES_DIR, exist_ok=True)
+        pgn_path = os.path.join(MATCHES_DIR, datetime.now().strftime("match-%Y%m%d-%H%M%S.pgn"))
+        settings["pgn"] = pgn_path
+        return MatchJournal(pgn_path + ".journal", settings, pgn_path)
+
+    def start_match(self, journal=None):
         if self.is_match_running:
             return
 
+        try:
+            self.num_games = int(self.games_var.get())
+            # "10+0.1" plays with clocks, a single number is a fixed time per move
+            time_text = self.time_var.get().strip()
+            self.time_control = parse_time_control(time_text) if "+" in time_text else None
+            if not self.time_control:
+                self.time_per_move = float(time_text)
+            self.concurrency = max(1, int(self.concurrency_var.get()))
+        except ValueError:
+            self.update_status("Invalid match settings.")
+            return
+        self.mode = self.mode_var.get()
+        if journal:
+            sprt_bounds = journal.settings["sprt"]  # [elo0, elo1] the match was started with
+        else:
+            sprt_bounds = [SPRT_ELO0, SPRT_ELO1] if self.sprt_var.get() else None
+        self.sprt = SPRT(*sprt_bounds) if sprt_bounds else None
+        # A resumed match adjudicates exactly as it was started, whichever front end started it
+        if journal:
+            adjudication = {key: journal.settings.get(key) for key in ("resign", "draw", "tb")}
+        elif self.adjudicate_var.get():
+            # Endgames are also scored by the tablebases, when there are any
+            adjudication = {
+                "resign": RESIGN_ADJUDICATION,
+                "draw": DRAW_ADJUDICATION,
+                "tb": TABLEBASE_DIR if tablebases.available else None,
+            }
+        else:
+            adjudication = {"resign": None, "draw": None, "tb": None}
+        self.adjudicator = self.create_adjudicator(adjudication)
+        # The seed is kept in the journal so a resumed match plays the openings in the same order
+        seed = journal.settings["seed"] if journal else random.randrange(2 ** 32)
+        self.openings = None
+        if self.openings_path:
+            self.openings = OpeningSuite(self.openings_path, shuffle=self.shuffle_openings_var.get(), seed=seed)
+        self.pairing_stats = None
+        try:
+            self.journal = journal or self.new_journal(seed, adjudication)
+            self.journal.open()
+        except OSError as e:
+            self.update_status(f"Cannot save the match: {str(e)}")
+            return
+
+        self.engine_names = (self.journal.settings["name1"], self.journal.settings["name2"])
+        # The runner exists before the thread starts, so Stop always has something to stop
+        try:
+            if self.mode == MATCH_MODE:
+                self.create_match_runner()
+            else:
+                self.create_tournament()
+        except Exception as e:
+            self.journal.close()
+            if self.adjudicator:
+                self.adjudicator.close()
+            self.update_status(f"Error: {str(e)}")
+            return
+        self.watched_moves = None
+        self.finished_games = set()
         self.is_match_running = True
         self.start_button.configure(state="disabled")
         self.stop_button.configure(state="normal")
         self.update_status("Match in progress...")
 
-        self.start_display_updates()  # Ensure display updates are running
-        self.match_thread = threading.Thread(target=self.run_match)
+        self.match_thread = threading.Thread(target=self.run_match, args=(self.match_runner, self.journal, self.adjudicator))
         self.match_thread.start()
 
+    def export_games(self):
+        # Finished games only; a running match keeps appending to game_history
+        games = list(self.game_history)
+        if not games:
+            self.update_status("No finished games to export.")
+            return
+        BulkExportDialog(self.root, game_chunks(games), len(games))
+
     def stop_match(self):
-        self.is_match_running = False
+        # Start stays disabled until the match thread has finished (see finish_match),
+        # so a new match never shares the screen with the one still winding down
+        if self.match_runner:
+            self.match_runner.stop()
         self.stop_button.configure(state="disabled")
-        self.start_button.configure(state="normal")
-        self.update_status("Match stopped.")
+        self.update_status("Stopping match...")
 
     def return_to_main_menu(self):
         self.is_match_running = False
+        if self.match_runner:
+            self.match_runner.stop()
         self.root.destroy()
 
 
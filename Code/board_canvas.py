@@ -0,0 +1,124 @@
+import chess
+
+from piece_sprites import piece_sprites
+from utils import get_piece_symbol
+
+LIGHT_SQUARE = "#e9edcc"
+DARK_SQUARE = "#779556"
+SELECTED_SQUARE = "#f7f769"  # Bright yellow for selected
+HOVER_LIGHT_SQUARE = "#baca44"
+HOVER_DARK_SQUARE = "#8fb344"
+COORDINATE_COLOR = "#cccccc"
+
+
+class BoardCanvas:
+    """Chessboard drawn on a Tk canvas whose items are created once and then reconfigured.
+
+    update() compares every square with what is already on screen and only
+    touches the squares whose colour or piece changed. Pieces are images from
+    the shared sprite cache when it can render them, text glyphs otherwise.
+    """
+
+    def __init__(self, canvas, square_size=60, show_coordinates=True):
+        self.canvas = canvas
+        self.square_size = square_size
+        self.show_coordinates = show_coordinates
+
+        self._square_items = {}
+        self._piece_items = {}
+        self._coordinate_items = []
+        self._shown = {}  # square -> (fill colour, piece symbol) currently on screen
+        self._sprites = {}  # piece symbol -> image at the current size, kept alive while it is shown
+        self.use_sprites = piece_sprites.get("K", square_size) is not None
+
+        self._create_items()
+
+    def _create_items(self):
+        self.canvas.delete("all")
+
+        # Squares first, then pieces, then coordinates so the stacking order is right
+        for square in chess.SQUARES:
+            self._square_items[square] = self.canvas.create_rectangle(0, 0, 0, 0, outline="")
+        for square in chess.SQUARES:
+            if self.use_sprites:
+                self._piece_items[square] = self.canvas.create_image(0, 0, anchor="center")
+            else:
+                self._piece_items[square] = self.canvas.create_text(0, 0, text="")
+
+        if self.show_coordinates:
+            for i in range(8):
+                self._coordinate_items.append(
+                    self.canvas.create_text(0, 0, text=chr(97 + i), font=('Segoe UI', 12), fill=COORDINATE_COLOR)
+                )
+                self._coordinate_items.append(
+                    self.canvas.create_text(0, 0, text=str(8 - i), font=('Segoe UI', 12), fill=COORDINATE_COLOR)
+                )
+
+        self._layout()
+
+    def _layout(self):
+        size = self.square_size
+        font = ('Segoe UI', int(size * 0.6), 'bold')
+        self._sprites = {}
+        for square in chess.SQUARES:
+            x = chess.square_file(square) * size
+            y = (7 - chess.square_rank(square)) * size
+            self.canvas.coords(self._square_items[square], x, y, x + size, y + size)
+            self.canvas.coords(self._piece_items[square], x + size // 2, y + size // 2)
+            if not self.use_sprites:
+                self.canvas.itemconfig(self._piece_items[square], font=font)
+            elif self._shown.get(square, (None, None))[1]:
+                self.canvas.itemconfig(self._piece_items[square], image=self._sprite(self._shown[square][1]))
+
+        for i in range(len(self._coordinate_items) // 2):
+            file_item = self._coordinate_items[2 * i]
+            rank_item = self._coordinate_items[2 * i + 1]
+            self.canvas.coords(file_item, i * size + size // 2, 8 * size - 12)
+            self.canvas.coords(rank_item, 12, i * size + size // 2)
+
+    def _sprite(self, symbol):
+        image = self._sprites.get(symbol)
+        if image is None:
+            image = self._sprites[symbol] = piece_sprites.get(symbol, self.square_size)
+        return image
+
+    def resize(self, square_size):
+        if square_size == self.square_size or square_size <= 0:
+            return
+        self.square_size = square_size
+        self._layout()
+
+    def square_at(self, x, y):
+        col = x // self.square_size
+        row = 7 - (y // self.square_size)
+        if not (0 <= col < 8 and 0 <= row < 8):
+            return None
+        return chess.square(col, row)
+
+    def update(self, board, selected=None, hover=None):
+        for square in chess.SQUARES:
+            piece = board.piece_at(square)
+            light = (chess.square_file(square) + chess.square_rank(square)) % 2 == 1
+            if square == selected:
+                color = SELECTED_SQUARE
+            elif square == hover:
+                color = HOVER_LIGHT_SQUARE if light else HOVER_DARK_SQUARE
+            else:
+                color = LIGHT_SQUARE if light else DARK_SQUARE
+
+            symbol = piece.symbol() if piece else None
+            shown_color, shown_symbol = self._shown.get(square, (None, None))
+            if color != shown_color:
+                self.canvas.itemconfig(self._square_items[square], fill=color)
+            if symbol != shown_symbol or square not in self._shown:
+                if self.use_sprites:
+                    self.canvas.itemconfig(self._piece_items[square], image=self._sprite(symbol) if piece else "")
+                elif piece:
+                    self.canvas.itemconfig(
+                        self._piece_items[square],
+                        text=get_piece_symbol(piece),
+                        fill="#ffffff" if piece.color == chess.WHITE else "#000000"
+                    )
+                else:
+                    self.canvas.itemconfig(self._piece_items[square], text="")
+            self._shown[square] = (color, symbol)
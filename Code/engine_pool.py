@@ -0,0 +1,181 @@
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+
+import chess.engine
+
+
+def pool_key(engine_path, options=None):
+    """Normalise an engine path and its UCI options into a hashable pool key."""
+    return os.path.abspath(engine_path), tuple(sorted((options or {}).items()))
+
+
+class EnginePool:
+    """Keeps UCI engine processes alive so callers only pay for search time.
+
+    Engines are lent out exclusively: a caller acquires one, searches with it
+    and hands it back, so screens running at the same time never share a
+    process mid-search. While engines of a key are lent out everything handed
+    back is kept, so a burst of borrowers reuses its processes; once the last
+    one comes back only `max_idle` stay warm. Callers that start many at once
+    (reviews, matches) also drain() their key when done.
+    """
+
+    def __init__(self, max_idle=2):
+        self.max_idle = max_idle
+        self._lock = threading.Condition()
+        self._idle = {}  # key -> list of warm engines
+        self._owner = {}  # engine -> key, for every live engine
+        self._lent = {}  # key -> engines currently borrowed
+        self._warming = set()  # keys with a pre-warm in progress
+        self._closed = False
+
+    def _spawn(self, key):
+        path, options = key
+        engine = chess.engine.SimpleEngine.popen_uci(path)
+        if options:
+            try:
+                engine.configure(dict(options))
+            except BaseException:
+                self._close_engine(engine)
+                raise
+        return engine
+
+    def acquire(self, engine_path, options=None):
+        key = pool_key(engine_path, options)
+        with self._lock:
+            # Wait for a pre-warm in flight rather than starting a second process
+            while not self._idle.get(key) and key in self._warming:
+                self._lock.wait()
+            while self._idle.get(key):
+                engine = self._idle[key].pop()
+                if self._is_alive(engine):
+                    self._lent[key] = self._lent.get(key, 0) + 1
+                    return engine
+                self._owner.pop(engine, None)
+
+        engine = self._spawn(key)
+        with self._lock:
+            self._owner[engine] = key
+            self._lent[key] = self._lent.get(key, 0) + 1
+        return engine
+
+    def _returned(self, key):
+        # Caller holds self._lock; returns how many engines of `key` are still lent out
+        lent = self._lent.get(key, 0) - 1
+        if lent > 0:
+            self._lent[key] = lent
+        else:
+            self._lent.pop(key, None)
+        return max(lent, 0)
+
+    def release(self, engine):
+        with self._lock:
+            key = self._owner.get(engine)
+            extra = []
+            if key is not None and not self._closed and self._is_alive(engine):
+                idle = self._idle.setdefault(key, [])
+                idle.append(engine)
+                if not self._returned(key):
+                    # The burst is over: keep only a few warm
+                    extra = idle[self.max_idle:]
+                    del idle[self.max_idle:]
+                    for spare in extra:
+                        self._owner.pop(spare, None)
+                self._lock.notify_all()
+            else:
+                if key is not None:
+                    self._returned(key)
+                self._owner.pop(engine, None)
+                extra = [engine]
+        for spare in extra:
+            self._close_engine(spare)
+
+    def drain(self, engine_path, options=None, keep=0):
+        """Close idle engines for this path and options until only `keep` remain."""
+        key = pool_key(engine_path, options)
+        with self._lock:
+            idle = self._idle.get(key, [])
+            engines = idle[keep:]
+            del idle[keep:]
+            for engine in engines:
+                self._owner.pop(engine, None)
+        for engine in engines:
+            self._close_engine(engine)
+
+    def discard(self, engine):
+        with self._lock:
+            key = self._owner.pop(engine, None)
+            if key is not None:
+                self._returned(key)
+        self._close_engine(engine)
+
+    @contextmanager
+    def engine(self, engine_path, options=None):
+        engine = self.acquire(engine_path, options)
+        try:
+            yield engine
+        except chess.engine.EngineTerminatedError:
+            self.discard(engine)
+            raise
+        except BaseException:
+            self.release(engine)
+            raise
+        else:
+            self.release(engine)
+
+    def prewarm(self, engine_path, options=None):
+        """Start an engine in the background so the first search does not wait for it."""
+        key = pool_key(engine_path, options)
+        with self._lock:
+            if self._closed or self._idle.get(key) or key in self._warming:
+                return
+            self._warming.add(key)
+
+        def warm():
+            engine = None
+            try:
+                engine = self._spawn(key)
+            except Exception as e:
+                print(f"Could not pre-warm engine {key[0]}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._warming.discard(key)
+                    if engine is not None:
+                        self._owner[engine] = key
+                        self._idle.setdefault(key, []).append(engine)
+                    self._lock.notify_all()
+
+        threading.Thread(target=warm, daemon=True).start()
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            engines = list(self._owner)
+            self._owner.clear()
+            self._idle.clear()
+            self._lent.clear()
+        for engine in engines:
+            self._close_engine(engine)
+
+    @staticmethod
+    def _is_alive(engine):
+        return not engine.protocol.returncode.done()
+
+    @staticmethod
+    def _close_engine(engine):
+        try:
+            engine.quit()
+        except Exception:
+            try:
+                engine.close()
+            except Exception:
+                pass
+
+
+# Shared by every screen in the process. Engines still running at exit keep
+# asyncio's child watcher threads alive, so they are shut down before the
+# interpreter joins non-daemon threads rather than from a plain atexit hook.
+engine_pool = EnginePool()
+getattr(threading, "_register_atexit", atexit.register)(engine_pool.shutdown)
@@ -0,0 +1,239 @@
+import json
+import os
+import threading
+from collections import namedtuple
+
+import chess.engine
+
+from eval_cache import CACHE_DIR
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+ENGINES_DIR = os.path.join(ROOT_DIR, "engines")
+CONFIG_PATH = os.path.join(ROOT_DIR, "engines.json")
+
+# Engines the toolkit has always offered, listed when their binary is present
+BUNDLED_ENGINES = {
+    "Stockfish": "Stockfish17.exe",
+    "Komodo Dragon": "KomodoDragon3.3.exe",
+    "Houdini": "Houdini.exe",
+    "Obsidian": "Obsidian.exe",
+}
+
+# Hash given to engines that support it when engines.json does not say otherwise
+DEFAULT_HASH_MB = 256
+
+# id name/author and every UCI option as name -> [type, default, min, max]
+EngineInfo = namedtuple("EngineInfo", "name author options")
+
+
+class EngineRegistry:
+    """The engines every screen offers, with the UCI options each runs with.
+
+    Entries come from the bundled engines, any other executable in engines/
+    and engines.json at the repository root, later ones winning:
+
+        {
+          "default": "Stockfish",
+          "threads": 30,
+          "hash": 4096,
+          "engines": {
+            "Stockfish": {"path": "engines/stockfish", "options": {"EvalFile": "/nets/big.nnue"}}
+          }
+        }
+
+    Threads and Hash are set to "threads" (all cores by default) and "hash"
+    for every engine that has them, within the range the engine accepts; an
+    engine's own "options" override both. What an engine supports is learned
+    from one UCI handshake, cached on disk (failures included) until the
+    binary changes.
+    """
+
+    def __init__(self, config_path=CONFIG_PATH, engines_dir=ENGINES_DIR,
+                 info_path=os.path.join(CACHE_DIR, "engines.json")):
+        self.config_path = config_path
+        self.engines_dir = engines_dir
+        self.info_path = info_path
+        self._lock = threading.Lock()
+        self._infos = None  # abspath -> cached probe
+        self._probing = set()  # paths with a background probe running
+        self.load()
+
+    def load(self):
+        config = {}
+        if os.path.exists(self.config_path):
+            with open(self.config_path, encoding="utf-8") as f:
+                config = json.load(f)
+        self.threads = config.get("threads") or os.cpu_count() or 1
+        self.hash = config.get("hash") or DEFAULT_HASH_MB
+
+        self.entries = {}  # name -> (path, options)
+        for name, filename in BUNDLED_ENGINES.items():
+            path = os.path.join(self.engines_dir, filename)
+            if os.path.isfile(path):
+                self.entries[name] = (os.path.abspath(path), {})
+        known = {path for path, _ in self.entries.values()}
+        if os.path.isdir(self.engines_dir):
+            for filename in sorted(os.listdir(self.engines_dir)):
+                path = os.path.abspath(os.path.join(self.engines_dir, filename))
+                if path not in known and self._is_engine(path):
+                    self.entries[os.path.splitext(filename)[0]] = (path, {})
+        for name, entry in config.get("engines", {}).items():
+            path = os.path.abspath(os.path.join(os.path.dirname(self.config_path), entry["path"]))
+            self.entries[name] = (path, dict(entry.get("options", {})))
+
+        if not self.entries:
+            # Nothing installed yet: keep offering the bundled names so the screens still open
+            for name, filename in BUNDLED_ENGINES.items():
+                self.entries[name] = (os.path.abspath(os.path.join(self.engines_dir, filename)), {})
+        self.default = config.get("default")
+        if self.default not in self.entries:
+            self.default = next(iter(self.entries))
+
+    @staticmethod
+    def _is_engine(path):
+        if not os.path.isfile(path):
+            return False
+        if path.lower().endswith(".exe"):
+            return True
+        return os.name != "nt" and os.access(path, os.X_OK)
+
+    @property
+    def names(self):
+        return list(self.entries)
+
+    def path(self, name):
+        return self.entries[name][0]
+
+    def paths(self):
+        """name -> path for every engine, as matches and tournaments take them."""
+        return {name: path for name, (path, _) in self.entries.items()}
+
+    def options(self, name, threads=None):
+        """UCI options for `name`; `threads` overrides the thread count, e.g. for parallel games.
+
+        Never starts the engine, so screens can call it on the Tk thread: until
+        the engine has been probed (in the background, started here if need be)
+        Threads and Hash are left at the engine's defaults.
+        """
+        path, configured = self.entries[name]
+        options = {}
+        info = self.cached_probe(name)
+        if info is not None:
+            for option, value in (("Threads", threads or self.threads), ("Hash", self.hash)):
+                if option in info.options:
+                    options[option] = self._clamp(info.options[option], value)
+        # Options set for this engine in engines.json win over everything
+        options.update(configured)
+        return options
+
+    @staticmethod
+    def _clamp(spec, value):
+        _, _, minimum, maximum = spec
+        if minimum is not None:
+            value = max(minimum, value)
+        if maximum is not None:
+            value = min(maximum, value)
+        return value
+
+    def _cached(self, path, stat):
+        # Caller holds self._lock; the cached probe of an unchanged binary, or None
+        cached = self._load_infos().get(path)
+        if cached is None or cached["mtime"] != stat.st_mtime or cached["size"] != stat.st_size:
+            return None
+        return cached
+
+    @staticmethod
+    def _info(cached):
+        if "error" in cached:
+            return None
+        return EngineInfo(cached["name"], cached["author"], cached["options"])
+
+    def cached_probe(self, name):
+        """EngineInfo for `name` if it has been probed; otherwise start a probe in the background."""
+        path = self.path(name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._cached(path, stat)
+            if cached is None:
+                if path not in self._probing:
+                    self._probing.add(path)
+                    threading.Thread(target=self._probe_later, args=(name, path), daemon=True).start()
+                return None
+        return self._info(cached)
+
+    def _probe_later(self, name, path):
+        try:
+            self.probe(name)
+        finally:
+            with self._lock:
+                self._probing.discard(path)
+
+    def probe(self, name):
+        """EngineInfo for `name`, or None if the engine cannot be started.
+
+        Runs a UCI handshake when the binary is new or changed, so keep it off the Tk thread.
+        """
+        path = self.path(name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._cached(path, stat)
+        if cached is None:
+            # Handshake without the lock, so options() is never held up by a probe
+            try:
+                cached = self._handshake(path)
+            except (OSError, chess.engine.EngineError, chess.engine.EngineTerminatedError) as e:
+                # Remembered too, so a broken binary is not started again until it changes
+                cached = {"error": str(e)}
+            cached.update(mtime=stat.st_mtime, size=stat.st_size)
+            with self._lock:
+                self._load_infos()[path] = cached
+                self._save_infos()
+        return self._info(cached)
+
+    def probe_all(self):
+        """Probe every engine; run off the Tk thread so screens never wait for a handshake."""
+        for name in self.names:
+            self.probe(name)
+
+    @staticmethod
+    def _handshake(path):
+        engine = chess.engine.SimpleEngine.popen_uci(path)
+        try:
+            return {
+                "name": engine.id.get("name"),
+                "author": engine.id.get("author"),
+                "options": {
+                    option.name: [option.type, option.default, option.min, option.max]
+                    for option in engine.options.values()
+                },
+            }
+        finally:
+            engine.quit()
+
+    def _load_infos(self):
+        # Caller holds self._lock
+        if self._infos is None:
+            self._infos = {}
+            try:
+                with open(self.info_path, encoding="utf-8") as f:
+                    self._infos = json.load(f)
+            except (OSError, ValueError):
+                pass
+        return self._infos
+
+    def _save_infos(self):
+        # Caller holds self._lock
+        os.makedirs(os.path.dirname(self.info_path), exist_ok=True)
+        temp_path = self.info_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self._infos, f, indent=1)
+        os.replace(temp_path, self.info_path)
+
+
+engine_registry = EngineRegistry()
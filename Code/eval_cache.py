@@ -0,0 +1,154 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import chess
+import chess.engine
+import chess.polyglot
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cache")
+
+
+def engine_id(engine_path, options=None):
+    """Identify an engine configuration; searches with different options never share entries.
+
+    Threads only changes how fast a depth is reached, not what the search at
+    that depth means, so it is left out: the analysis board and a review
+    with fewer threads per engine read each other's results.
+    """
+    options = {name: value for name, value in (options or {}).items() if name != "Threads"}
+    return os.path.abspath(engine_path) + json.dumps(options, sort_keys=True)
+
+
+class EvalCache:
+    """Engine evaluations keyed by Zobrist hash, kept in an LRU and persisted to SQLite.
+
+    Only the deepest result seen for a position is kept, so a cached entry can
+    stand in for any search that would stop at or below its depth. Which
+    result is deeper is decided in one place, the SQLite upsert: new results
+    are queued for it and the LRU only holds rows read back from the table.
+    """
+
+    def __init__(self, path=None, max_entries=100000, flush_every=50):
+        self.path = path or os.path.join(CACHE_DIR, "eval_cache.sqlite3")
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (zobrist, engine_id) -> (depth, score, pv)
+        self._pending = []  # (zobrist, engine_id, depth, score, pv) not yet in the table
+        self._db = None
+
+    def _connect(self):
+        # Caller holds self._lock
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS evals ("
+                "zobrist INTEGER NOT NULL, engine TEXT NOT NULL, depth INTEGER NOT NULL, "
+                "score TEXT NOT NULL, pv TEXT NOT NULL, PRIMARY KEY (zobrist, engine))"
+            )
+        return self._db
+
+    def get(self, board, engine, min_depth=0):
+        """Return an info dict shaped like engine.analyse() output, or None."""
+        key = (self._hash(board), engine)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._remember(key, entry)
+            else:
+                self._flush()
+                row = self._connect().execute(
+                    "SELECT depth, score, pv FROM evals WHERE zobrist = ? AND engine = ?",
+                    (key[0] - 2 ** 63, engine)
+                ).fetchone()
+                if row is None:
+                    return None
+                entry = row
+                self._remember(key, entry)
+
+        depth, score, pv = entry
+        if depth < min_depth:
+            return None
+        return {
+            "depth": depth,
+            "score": self._decode_score(score, board.turn),
+            "pv": [chess.Move.from_uci(uci) for uci in pv.split()],
+        }
+
+    def put(self, board, engine, info):
+        if "score" not in info or "pv" not in info:
+            return
+        if info.get("lowerbound") or info.get("upperbound"):
+            return  # From an unfinished iteration: the score is only a bound
+        key = (self._hash(board), engine)
+        with self._lock:
+            # Read back from the table on the next get(), whichever result the upsert keeps
+            self._entries.pop(key, None)
+            self._pending.append(key + (
+                info.get("depth", 0),
+                self._encode_score(info["score"]),
+                " ".join(move.uci() for move in info["pv"])
+            ))
+            if len(self._pending) >= self.flush_every:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _flush(self):
+        if not self._pending:
+            return
+        db = self._connect()
+        with db:
+            # Keep whichever of the stored and the new result is deeper
+            db.executemany(
+                "INSERT INTO evals (zobrist, engine, depth, score, pv) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (zobrist, engine) DO UPDATE SET "
+                "depth = excluded.depth, score = excluded.score, pv = excluded.pv "
+                "WHERE excluded.depth > evals.depth",
+                [(row[0] - 2 ** 63,) + row[1:] for row in self._pending]
+            )
+        self._pending.clear()
+
+    @staticmethod
+    def _hash(board):
+        return chess.polyglot.zobrist_hash(board)
+
+    @staticmethod
+    def _encode_score(pov_score):
+        # Stored from White's point of view so it does not depend on the side to move
+        score = pov_score.white()
+        if score.is_mate():
+            return f"mate {score.mate()}"
+        return f"cp {score.score()}"
+
+    @staticmethod
+    def _decode_score(text, turn):
+        kind, value = text.split()
+        score = chess.engine.Mate(int(value)) if kind == "mate" else chess.engine.Cp(int(value))
+        # Hand back the same orientation the engine reports: relative to the side to move
+        return chess.engine.PovScore(score if turn == chess.WHITE else -score, turn)
+
+
+eval_cache = EvalCache()
+atexit.register(eval_cache.close)
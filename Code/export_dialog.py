@@ -1,4 +1,27 @@
 import customtkinter as ctk
+from tkinter import filedialog, messagebox
+
+from pgn_export import PgnExport, check_pgn_output
+
+PGN_FILETYPES = [("PGN files", "*.pgn"), ("Gzip PGN", "*.pgn.gz"), ("Zstandard PGN", "*.pgn.zst")]
+
+
+def ask_export_path(parent):
+    path = filedialog.asksaveasfilename(
+        parent=parent,
+        title="Export PGN",
+        defaultextension=".pgn",
+        filetypes=PGN_FILETYPES
+    )
+    if path:
+        # Refuse a format that cannot be written before anything is exported
+        try:
+            check_pgn_output(path)
+        except ValueError as e:
+            messagebox.showerror("Export PGN", str(e), parent=parent)
+            return None
+    return path
+
 
 class ExportDialog:
     def __init__(self, parent, pgn_text):
@@ -38,6 +61,14 @@ class ExportDialog:
             command=self.copy_to_clipboard
         )
         copy_button.pack(side="left", padx=(0, 10))
+
+        save_button = ctk.CTkButton(
+            button_frame,
+            text="Save As...",
+            width=120,
+            command=self.save_to_file
+        )
+        save_button.pack(side="left", padx=(0, 10))
         
         close_button = ctk.CTkButton(
             button_frame,
@@ -48,10 +79,87 @@ class ExportDialog:
         close_button.pack(side="left")
 
     def on_close(self):
+        if not self.window.winfo_exists():
+            return
         self.window.grab_release()
         self.window.destroy()
-        
+
+    def save_to_file(self):
+        path = ask_export_path(self.window)
+        if path:
+            pgn_content = self.pgn_text.get("1.0", "end-1c").rstrip()
+            export = PgnExport([pgn_content.encode("utf-8") + b"\n\n"], path, total=1)
+            export.run()
+            if export.error:
+                messagebox.showerror("Export PGN", f"Could not save the PGN: {export.error}", parent=self.window)
+
     def copy_to_clipboard(self):
         pgn_content = self.pgn_text.get("1.0", "end-1c")
         self.window.clipboard_clear()
         self.window.clipboard_append(pgn_content)
+
+
+class BulkExportDialog:
+    """Streams many games to a file chosen by the user, with progress and cancel.
+
+    Nothing is shown in a text box, so exports of any size use flat memory.
+    """
+
+    def __init__(self, parent, chunks, total, title="Export Games"):
+        path = ask_export_path(parent)
+        if not path:
+            return
+
+        self.window = ctk.CTkToplevel(parent)
+        self.window.title(title)
+        self.window.geometry("450x150")
+        self.window.transient(parent)
+        self.window.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        self.export = PgnExport(chunks, path, total)
+
+        self.main_container = ctk.CTkFrame(self.window, fg_color="transparent")
+        self.main_container.pack(fill="both", expand=True, padx=20, pady=20)
+
+        self.status_label = ctk.CTkLabel(
+            self.main_container,
+            text=f"Exporting 0 of {total:,} games",
+            font=ctk.CTkFont(family="Segoe UI", size=14)
+        )
+        self.status_label.pack(anchor="w")
+
+        self.progress_bar = ctk.CTkProgressBar(self.main_container)
+        self.progress_bar.pack(fill="x", pady=10)
+        self.progress_bar.set(0)
+
+        self.cancel_button = ctk.CTkButton(
+            self.main_container,
+            text="Cancel",
+            width=120,
+            command=self.on_close
+        )
+        self.cancel_button.pack(anchor="w")
+
+        self.export.start()
+        self.poll_export()
+
+    def poll_export(self):
+        # The dialog may have been closed while the export was running
+        if not self.window.winfo_exists():
+            return
+        export = self.export
+        if export.total:
+            self.progress_bar.set(export.done / export.total)
+        if not export.finished.is_set():
+            self.status_label.configure(text=f"Exporting {export.done:,} of {export.total:,} games")
+            self.window.after(100, self.poll_export)
+        elif export.error:
+            self.status_label.configure(text=f"Error: {export.error}")
+            self.cancel_button.configure(text="Close")
+        else:
+            self.status_label.configure(text=f"Exported {export.done:,} games")
+            self.cancel_button.configure(text="Close")
+
+    def on_close(self):
+        self.export.cancel()
+        self.window.destroy()
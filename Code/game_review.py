@@ -0,0 +1,163 @@
+import os
+import queue
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import chess
+import chess.engine
+import chess.pgn
+
+from engine_pool import engine_pool
+from eval_cache import eval_cache, engine_id
+
+# Centipawn loss at which a move gets each label
+INACCURACY = 50
+MISTAKE = 100
+BLUNDER = 300
+
+# Scores are clamped before comparing so that won/lost positions don't flag every move
+SCORE_CLAMP = 1000
+
+# Cached evaluations shallower than this are searched again; about what a review search reaches
+REVIEW_DEPTH = 18
+
+MoveReview = namedtuple("MoveReview", "ply san best_san loss label nag")
+
+
+def classify(loss):
+    """Label and NAG for a centipawn loss, or (None, None) for a good move."""
+    if loss >= BLUNDER:
+        return "??", chess.pgn.NAG_BLUNDER
+    if loss >= MISTAKE:
+        return "?", chess.pgn.NAG_MISTAKE
+    if loss >= INACCURACY:
+        return "?!", chess.pgn.NAG_DUBIOUS_MOVE
+    return None, None
+
+
+class GameReview:
+    """Analyses every position of a game on a pool of engines in parallel.
+
+    Results are pushed to `events` as (kind, payload) pairs as they complete:
+    ("progress", (done, total)) after every position, ("move", MoveReview) as
+    soon as both positions around a move are known, and ("done", None) at the
+    end.
+    """
+
+    def __init__(self, game, engine_path, options=None, workers=None, time_per_position=0.3):
+        self.engine_path = engine_path
+        self.options = options
+        self.workers = workers or max(1, (os.cpu_count() or 2) // 2)
+        self.limit = chess.engine.Limit(time=time_per_position)
+        self.events = queue.Queue()
+
+        board = game.board()
+        self.boards = [board.copy()]
+        self.moves = []
+        for move in game.mainline_moves():
+            self.moves.append(move)
+            board.push(move)
+            self.boards.append(board.copy())
+
+        self._infos = [None] * len(self.boards)
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def _run(self):
+        total = len(self.boards)
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            # Positions near the start first, so the top of the move list fills in first
+            futures = {executor.submit(self._analyse, ply): ply for ply in range(total)}
+            for future in as_completed(futures):
+                if self._cancelled.is_set():
+                    break
+                ply = futures[future]
+                try:
+                    info = future.result()
+                except Exception as e:
+                    self.events.put(("error", str(e)))
+                    self.cancel()
+                    break
+                done += 1
+                self.events.put(("progress", (done, total)))
+                self._store(ply, info)
+        # One engine per worker was started; keep a single one warm
+        engine_pool.drain(self.engine_path, self.options, keep=1)
+        self.events.put(("done", None))
+
+    def _analyse(self, ply):
+        if self._cancelled.is_set():
+            return None
+        board = self.boards[ply]
+        if board.is_game_over():
+            return {"score": self._terminal_score(board), "pv": []}
+
+        engine = engine_id(self.engine_path, self.options)
+        cached = eval_cache.get(board, engine, min_depth=REVIEW_DEPTH)
+        if cached is not None and cached["pv"]:
+            return cached
+        with engine_pool.engine(self.engine_path, self.options) as uci_engine:
+            info = uci_engine.analyse(board, self.limit)
+        eval_cache.put(board, engine, info)
+        return info
+
+    @staticmethod
+    def _terminal_score(board):
+        if board.is_checkmate():
+            return chess.engine.PovScore(chess.engine.Mate(0), board.turn)
+        return chess.engine.PovScore(chess.engine.Cp(0), board.turn)
+
+    def _store(self, ply, info):
+        if info is None:
+            return
+        with self._lock:
+            self._infos[ply] = info
+            # Move `ply` connects positions ply and ply + 1; move ply - 1 ends here
+            for move_ply in (ply - 1, ply):
+                if 0 <= move_ply < len(self.moves):
+                    before = self._infos[move_ply]
+                    after = self._infos[move_ply + 1]
+                    if before is not None and after is not None:
+                        self.events.put(("move", self._review_move(move_ply, before, after)))
+
+    def _review_move(self, ply, before, after):
+        board = self.boards[ply]
+        mover = board.turn
+        move = self.moves[ply]
+        best = before["pv"][0] if before.get("pv") else None
+
+        if best == move:
+            loss = 0
+        else:
+            score_before = self._clamped(before["score"], mover)
+            score_after = self._clamped(after["score"], mover)
+            loss = max(0, score_before - score_after)
+
+        label, nag = classify(loss)
+        return MoveReview(
+            ply=ply,
+            san=board.san(move),
+            best_san=board.san(best) if best is not None else None,
+            loss=loss,
+            label=label,
+            nag=nag
+        )
+
+    @staticmethod
+    def _clamped(pov_score, color):
+        cp = pov_score.pov(color).score(mate_score=100000)
+        return max(-SCORE_CLAMP, min(SCORE_CLAMP, cp))
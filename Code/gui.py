@@ -6,32 +6,61 @@ import chess.pgn
 import customtkinter as ctk
 from tkinter import Listbox  # Add Listbox for move selection
 
-from utils import get_piece_symbol
+from board_canvas import BoardCanvas
+from engine_registry import engine_registry
+from eval_cache import eval_cache, engine_id
+from game_review import GameReview
+from live_analysis import LiveAnalysis
+from opening_explorer import OpeningExplorer
+from move_list import MoveList
+from position_index import PositionIndex
+from position_search import PositionSearch
+from tablebase import tablebases
+
+# Milliseconds the board waits for resizing to stop before redrawing at the new size
+RESIZE_DELAY = 150
+
+# Move list colours for game review labels
+REVIEW_COLORS = {
+    "?!": "#f7f769",  # Inaccuracy
+    "?": "#e69a00",  # Mistake
+    "??": "#d64045",  # Blunder
+}
+
+# The note a review adds to a move's comment
+REVIEW_NOTE = re.compile(r"\s*Best was \S+ \(-\d+\.\d\d\)")
 
 
 class ModernChessGUI:
-    def __init__(self, root, position, engine_path="../engines/Stockfish17.exe"):
+    def __init__(self, root, position, engine_name=None):
         # Initialize customtkinter settings
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
 
         # Initialize properties
         self.root = root
-        self.engine_path = engine_path
-        self.engines = {
-            "Stockfish": "../engines/Stockfish17.exe",
-            "Komodo Dragon": "../engines/KomodoDragon3.3.exe",
-            "Houdini": "../engines/Houdini.exe",
-            "Obsidian": "../engines/Obsidian.exe",
-        }
+        self.engine_name = engine_name or engine_registry.default
+        self.engine_path = engine_registry.path(self.engine_name)
         self.board = chess.Board(position)
         self.square_size = 60
+        self.resize_timer = None
         self.selected_square = None
         self.hover_square = None
         self.game = chess.pgn.Game()
         self.node = self.game
+        self.position_index = PositionIndex(self.board, self.game)
         self.current_move_index = -1
-        self.THINK_TIME = 0.05
+        # Cached evaluations at least this deep are shown without running the engine
+        self.cache_depth = 20
+        self.shown_depth = 0
+        self.multipv = 1  # Lines shown by the live analysis
+        self.review = None
+        self.paused = False  # Hidden behind another screen
+        self.move_reviews = {}  # ply -> MoveReview from the last game review
+        self.database = None  # PgnDatabase opened from the import dialog
+        self.position_search = None
+        self.explorer = None  # OpeningExplorer over the same database
+        self.explorer_moves = []
 
         # Create the main window as a frame inside root
         self.main_container = ctk.CTkFrame(self.root)
@@ -44,6 +73,14 @@ class ModernChessGUI:
         self.create_side_panel()
         self.draw_board()
 
+        # Engine search runs in the background and is cancelled whenever the position changes
+        self.live_analysis = LiveAnalysis(
+            self.root,
+            on_update=self.on_analysis_update,
+            on_error=self.on_analysis_error
+        )
+        self.main_container.bind("<Destroy>", self.on_destroy)
+
         # Bind events
         self.canvas.bind("<Button-1>", self.on_square_clicked)
         self.canvas.bind("<Motion>", self.on_square_hover)
@@ -89,14 +126,36 @@ class ModernChessGUI:
             corner_radius=8,
             command=self.export_pgn
         )
-        self.export_button.pack(side="left")
+        self.export_button.pack(side="left", padx=(0, 10))
+
+        self.review_button = ctk.CTkButton(
+            buttons_frame,
+            text="Review Game",
+            width=100,
+            height=32,
+            font=ctk.CTkFont(family="Segoe UI", size=12),
+            corner_radius=8,
+            command=self.start_review
+        )
+        self.review_button.pack(side="left", padx=(0, 10))
+
+        self.find_games_button = ctk.CTkButton(
+            buttons_frame,
+            text="Find Games",
+            width=100,
+            height=32,
+            font=ctk.CTkFont(family="Segoe UI", size=12),
+            corner_radius=8,
+            command=self.find_games
+        )
+        self.find_games_button.pack(side="left")
 
         # Engine selection (right side)
-        self.engine_var = ctk.StringVar(value="Stockfish")
+        self.engine_var = ctk.StringVar(value=self.engine_name)
 
         self.engine_menu = ctk.CTkOptionMenu(
             self.header,
-            values=list(self.engines.keys()),
+            values=engine_registry.names,
             variable=self.engine_var,
             width=150,
             font=ctk.CTkFont(family="Segoe UI", size=14),
@@ -111,6 +170,23 @@ class ModernChessGUI:
         )
         engine_label.pack(side="right", padx=(0, 10))
 
+        # Number of best lines searched at once
+        self.multipv_menu = ctk.CTkOptionMenu(
+            self.header,
+            values=[str(lines) for lines in range(1, 6)],
+            width=60,
+            font=ctk.CTkFont(family="Segoe UI", size=14),
+            command=self.on_multipv_change
+        )
+        self.multipv_menu.set(str(self.multipv))
+        self.multipv_menu.pack(side="right", padx=(0, 20))
+
+        ctk.CTkLabel(
+            self.header,
+            text="Lines:",
+            font=ctk.CTkFont(family="Segoe UI", size=14)
+        ).pack(side="right", padx=(0, 10))
+
     def create_main_layout(self):
         self.main_frame = ctk.CTkFrame(self.main_container, corner_radius=0, fg_color="transparent")
         self.main_frame.pack(fill="both", expand=True, padx=20, pady=10)
@@ -129,6 +205,8 @@ class ModernChessGUI:
             highlightthickness=0
         )
         self.canvas.pack(fill="both", expand=True)
+        self.board_view = BoardCanvas(self.canvas, self.square_size)
+        self.canvas.config(width=8 * self.square_size, height=8 * self.square_size)
 
         # Turn indicator
         self.turn_frame = ctk.CTkFrame(self.board_frame, corner_radius=10, height=40, fg_color="#1f538d")
@@ -185,10 +263,53 @@ class ModernChessGUI:
             fg="white"
         )
         self.black_moves_listbox.grid(row=0, column=1, sticky="nsew", padx=(5, 0))
+        self.move_list = MoveList(self.white_moves_listbox, self.black_moves_listbox)
 
         self.white_moves_listbox.bind("<<ListboxSelect>>", self.on_pgn_select)
         self.black_moves_listbox.bind("<<ListboxSelect>>", self.on_pgn_select)
 
+        # Game review progress and summary
+        self.review_label = ctk.CTkLabel(
+            history_frame,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=12),
+            text_color="gray70"
+        )
+        self.review_label.pack(padx=10, pady=(0, 5), anchor="w")
+
+        # What the review found for the selected move
+        self.review_detail_label = ctk.CTkLabel(
+            history_frame,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=12),
+            text_color="gray70"
+        )
+        self.review_detail_label.pack(padx=10, pady=(0, 5), anchor="w")
+
+        # Opening explorer for the database opened from Import PGN
+        explorer_label = ctk.CTkLabel(
+            self.side_panel,
+            text="OPENING EXPLORER",
+            font=ctk.CTkFont(family="Segoe UI", size=16, weight="bold")
+        )
+        explorer_label.pack(pady=(0, 10), padx=20, anchor="w")
+
+        explorer_frame = ctk.CTkFrame(self.side_panel, corner_radius=10, fg_color="#2b2b2b")
+        explorer_frame.pack(fill="x", padx=20, pady=(0, 10))
+
+        self.explorer_listbox = Listbox(
+            explorer_frame,
+            font=("Consolas", 11),
+            height=6,
+            selectmode="single",
+            exportselection=False,
+            bg="#2b2b2b",
+            fg="white"
+        )
+        self.explorer_listbox.pack(fill="x", padx=10, pady=10)
+        self.explorer_listbox.bind("<Double-Button-1>", self.on_explorer_select)
+        self.explorer_listbox.insert("end", "Open a PGN file with Import PGN")
+
         # Engine analysis section
         analysis_label = ctk.CTkLabel(
             self.side_panel,
@@ -221,76 +342,18 @@ class ModernChessGUI:
         self.analysis_text.pack(fill="both", expand=True, padx=10, pady=10)
 
     def draw_board(self):
-        self.canvas.delete("all")
-        board_size = 8 * self.square_size
-        self.canvas.config(width=board_size, height=board_size)
-
-        # Draw board background
-        self.canvas.create_rectangle(0, 0, board_size, board_size, fill="#2b2b2b", outline="")
-
-        # Draw squares
-        for row in range(8):
-            for col in range(8):
-                x = col * self.square_size
-                y = row * self.square_size
-                color = "#e9edcc" if (row + col) % 2 == 0 else "#779556"
-                square = chess.square(col, 7 - row)
-
-                # Highlight selected and hover squares
-                if self.selected_square == square:
-                    color = "#f7f769"  # Bright yellow for selected
-                elif self.hover_square == square and self.board.piece_at(square):
-                    if self.board.piece_at(square).color == self.board.turn:
-                        color = "#baca44" if (row + col) % 2 == 0 else "#8fb344"
-
-                self.canvas.create_rectangle(
-                    x, y,
-                    x + self.square_size,
-                    y + self.square_size,
-                    fill=color,
-                    outline=""
-                )
-
-                # Draw pieces
-                piece = self.board.piece_at(square)
-                if piece:
-                    text = get_piece_symbol(piece)
-                    fill_color = "#ffffff" if piece.color == chess.WHITE else "#000000"
-                    self.canvas.create_text(
-                        x + self.square_size // 2,
-                        y + self.square_size // 2,
-                        text=text,
-                        font=('Segoe UI', int(self.square_size * 0.6), 'bold'),
-                        fill=fill_color
-                    )
-
-        # Draw coordinates
-        for i in range(8):
-            # File labels (a-h)
-            file_label = chr(97 + i)
-            x = i * self.square_size + self.square_size // 2
-            y = board_size - 12
-            self.canvas.create_text(
-                x, y,
-                text=file_label,
-                font=('Segoe UI', 12),
-                fill="#cccccc"
-            )
-
-            # Rank labels (1-8)
-            rank_label = str(8 - i)
-            x = 12
-            y = i * self.square_size + self.square_size // 2
-            self.canvas.create_text(
-                x, y,
-                text=rank_label,
-                font=('Segoe UI', 12),
-                fill="#cccccc"
-            )
-
-        # Update status
+        self.update_board_view()
         self.update_status_labels()
 
+    def update_board_view(self):
+        # Hover highlight only for pieces of the side to move
+        hover = None
+        if self.hover_square is not None:
+            piece = self.board.piece_at(self.hover_square)
+            if piece and piece.color == self.board.turn:
+                hover = self.hover_square
+        self.board_view.update(self.board, selected=self.selected_square, hover=hover)
+
     def update_status_labels(self):
         status_text = ""
         if self.board.is_checkmate():
@@ -309,27 +372,130 @@ class ModernChessGUI:
         self.turn_label.configure(text=status_text)
         self.turn_frame.configure(fg_color=bg_color)
 
+    @property
+    def engine_options(self):
+        # Looked up each time: Threads and Hash appear once the background probe has run
+        return engine_registry.options(self.engine_name)
+
     def on_engine_change(self, engine_name):
-        self.engine_path = self.engines[engine_name]
+        # The previous engine stays warm in the pool in case the user switches back
+        self.engine_name = engine_name
+        self.engine_path = engine_registry.path(engine_name)
         self.analysis_text.delete("1.0", "end")
         self.analysis_text.insert("1.0", f"Engine changed to: {engine_name}\n")
         self.analyze_position()
 
     def analyze_position(self):
-        with chess.engine.SimpleEngine.popen_uci(self.engine_path) as engine:
-            info = engine.analyse(self.board, chess.engine.Limit(time=self.THINK_TIME))
-            self.display_analysis(info)
-            self.update_evaluation_bar(info['score'].relative)
+        self.shown_depth = 0
+        if self.board.is_game_over():
+            self.live_analysis.stop()
+            return
 
-    def display_analysis(self, info):
-        self.analysis_text.delete("1.0", "end")
+        # Endgames in the tablebases are solved: show the exact result instead of searching
+        probe = tablebases.probe(self.board)
+        if probe is not None:
+            self.live_analysis.stop()
+            self.show_tablebase(probe)
+            return
+
+        # The cache only holds the best line, so it can stand in for single-line analysis only
+        cached = eval_cache.get(self.board, engine_id(self.engine_path, self.engine_options)) if self.multipv == 1 else None
+        if cached is not None:
+            self.show_analysis([cached])
+            if cached["depth"] >= self.cache_depth:
+                self.live_analysis.stop()
+                return
+        if self.paused or self.review is not None:
+            # A running review has the cores to itself, so its timings and depths hold
+            self.live_analysis.stop()
+            return
+        self.live_analysis.start(self.board, self.engine_path, self.engine_options, multipv=self.multipv)
+
+    def on_analysis_update(self, lines):
+        # Keep showing a cached result until the live search gets past it
+        if lines[0].get("depth", 0) < self.shown_depth:
+            return
+        eval_cache.put(self.board, engine_id(self.engine_path, self.engine_options), lines[0])
+        self.show_analysis(lines)
+
+    def on_multipv_change(self, value):
+        self.multipv = int(value)
+        self.analyze_position()
+
+    def show_analysis(self, lines):
+        self.shown_depth = lines[0].get("depth", 0)
+        self.display_analysis(lines)
+        self.update_evaluation_bar(lines[0]['score'].relative)
+
+    def show_tablebase(self, probe):
+        self.shown_depth = 0
+        if probe.wdl > 1:
+            outcome = "Win"
+        elif probe.wdl < -1:
+            outcome = "Loss"
+        else:
+            outcome = "Draw"  # Including wins and losses spoiled by the 50-move rule
+        side = "White" if self.board.turn == chess.WHITE else "Black"
         analysis_lines = [
-            f"{self.engine_var.get()} Analysis:",
-            f"Evaluation: {self.format_score(info['score'].relative)}",
-            f"Best line: {self.format_pv(info['pv'])}"
+            "Syzygy tablebase:",
+            f"{outcome} for {side}" + (f" (DTZ {abs(probe.dtz)})" if probe.dtz else ""),
         ]
+        if probe.move is not None:
+            analysis_lines.append(f"Best move: {self.board.san(probe.move)}")
+        self.analysis_text.delete("1.0", "end")
         self.analysis_text.insert("1.0", "\n".join(analysis_lines))
 
+        result = tablebases.result(self.board)
+        self.update_evaluation_bar(
+            tablebases.score(probe, self.board.turn).relative,
+            text="TB draw" if result == "1/2-1/2" else f"TB {result}"
+        )
+
+    def on_analysis_error(self, message):
+        self.analysis_text.delete("1.0", "end")
+        self.analysis_text.insert("1.0", f"Engine error: {message}")
+
+    def display_analysis(self, lines):
+        self.analysis_text.delete("1.0", "end")
+        if len(lines) == 1:
+            info = lines[0]
+            analysis_lines = [
+                f"{self.engine_var.get()} Analysis (depth {info.get('depth', 0)}):",
+                f"Evaluation: {self.format_score(info['score'].relative)}",
+                f"Best line: {self.format_pv(info['pv'])}",
+                self.format_search_stats(info)
+            ]
+        else:
+            analysis_lines = [f"{self.engine_var.get()} Analysis ({len(lines)} lines):"]
+            for number, info in enumerate(lines, 1):
+                analysis_lines.append(
+                    f"{number}) {self.format_score(info['score'].relative)}  {self.format_pv(info['pv'])}"
+                )
+                analysis_lines.append(f"    {self.format_search_stats(info)}")
+        self.analysis_text.insert("1.0", "\n".join(line for line in analysis_lines if line))
+
+    def format_search_stats(self, info):
+        # Cached results carry only the depth; the rest is shown while the engine runs
+        stats = []
+        if "depth" in info:
+            depth = f"depth {info['depth']}"
+            if "seldepth" in info:
+                depth += f"/{info['seldepth']}"
+            stats.append(depth)
+        if "nodes" in info:
+            stats.append(f"{self.format_count(info['nodes'])} nodes")
+        if "nps" in info:
+            stats.append(f"{self.format_count(info['nps'])} nps")
+        return ", ".join(stats) if len(stats) > 1 else ""
+
+    @staticmethod
+    def format_count(count):
+        if count >= 1000000:
+            return f"{count / 1000000:.1f}M"
+        if count >= 1000:
+            return f"{count / 1000:.0f}k"
+        return str(count)
+
     def format_score(self, score):
         if score.is_mate():
             mate_value = score.mate()
@@ -349,7 +515,7 @@ class ModernChessGUI:
             board_copy.push(move)
         return " ".join(moves[:5]) + ("..." if len(moves) > 5 else "")
 
-    def update_evaluation_bar(self, score):
+    def update_evaluation_bar(self, score, text=None):
 
         self.evaluation_bar.delete("all")
         bar_width = self.evaluation_bar.winfo_width()
@@ -387,9 +553,9 @@ class ModernChessGUI:
         )
 
         # Format score text
-        if score.is_mate():
+        if text is None and score.is_mate():
             text = f"M{score.mate()}"
-        else:
+        elif text is None:
             text = f"{score.score() / 100:+.2f}"
 
         # Position and style text based on winning side
@@ -412,11 +578,9 @@ class ModernChessGUI:
             anchor=text_anchor)
 
     def on_square_clicked(self, event):
-        col = (event.x) // self.square_size
-        row = 7 - (event.y // self.square_size)
-        if not (0 <= col < 8 and 0 <= row < 8):
+        square = self.board_view.square_at(event.x, event.y)
+        if square is None:
             return
-        square = chess.square(col, row)
         piece = self.board.piece_at(square)
 
         if self.selected_square is None:
@@ -433,24 +597,18 @@ class ModernChessGUI:
     def make_move(self, move):
         self.board.push(move)
         self.node = self.node.add_variation(move)
+        if self.node.is_mainline():
+            self.position_index.append(move, self.node)
         self.selected_square = None
         self.current_move_index += 1
         self.update_pgn_display()
         self.analyze_position()
+        self.update_explorer()
 
     def update_pgn_display(self):
-        self.white_moves_listbox.delete(0, "end")
-        self.black_moves_listbox.delete(0, "end")
-        board = chess.Board()
-        for i, move in enumerate(self.game.mainline_moves()):
-            move_text = board.san(move)
-            if i % 2 == 0:
-                self.white_moves_listbox.insert("end", f"{(i // 2) + 1}. {move_text}")
-            else:
-                self.black_moves_listbox.insert("end", move_text)
-            board.push(move)
-        if self.white_moves_listbox.size() > 0 or self.black_moves_listbox.size() > 0:
-            self.highlight_selected_move(self.current_move_index)
+        # Only moves that are new since the last call are inserted
+        self.move_list.sync(self.position_index.sans)
+        self.highlight_selected_move(self.current_move_index)
 
     def on_pgn_select(self, event):
         selected_index = (
@@ -463,39 +621,132 @@ class ModernChessGUI:
             self.go_to_move(move_index)
 
     def highlight_selected_move(self, move_index):
-        self.white_moves_listbox.selection_clear(0, "end")
-        self.black_moves_listbox.selection_clear(0, "end")
-        if move_index % 2 == 0:
-            self.white_moves_listbox.selection_set(move_index // 2)
-        else:
-            self.black_moves_listbox.selection_set(move_index // 2)
+        self.move_list.select(move_index)
+        self.show_move_review()
 
     def go_to_move(self, move_index):
-        self.board = chess.Board()
-        self.node = self.game
-        for i, move in enumerate(self.game.mainline_moves()):
-            if i > move_index:
-                break
-            self.board.push(move)
-            self.node = self.node.variation(0)
+        move_index = min(move_index, len(self.position_index) - 1)
+        self.board = self.position_index.board_at(move_index + 1)
+        self.node = self.position_index.nodes[move_index + 1]
         self.current_move_index = move_index
         self.draw_board()
         self.analyze_position()
+        self.update_explorer()
         self.highlight_selected_move(move_index)
 
+    def show_move_review(self):
+        review = self.move_reviews.get(self.current_move_index)
+        text = ""
+        if review is not None and review.label and review.best_san:
+            text = f"{review.san}{review.label}  Best was {review.best_san} (-{review.loss} cp)"
+        elif review is not None:
+            text = f"{review.san}: good move"
+        self.review_detail_label.configure(text=text)
+
+    def start_review(self):
+        if self.review:
+            self.review.cancel()
+        for ply, review in self.move_reviews.items():
+            if review.label:
+                self.move_list.annotate(ply)
+        self.move_reviews = {}
+        self.review_detail_label.configure(text="")
+        self.review_nodes = list(self.game.mainline())
+        if not self.review_nodes:
+            self.review_label.configure(text="Nothing to review yet")
+            return
+
+        # The review runs an engine for every two cores, so each gets two threads; the eval
+        # cache ignores Threads, so the review and the analysis board share their results
+        self.review = GameReview(self.game, self.engine_path, engine_registry.options(self.engine_name, threads=2))
+        self.live_analysis.stop()
+        self.review.start()
+        self.review_label.configure(text="Reviewing...")
+        self.root.after(100, self.poll_review, self.review)
+
+    def poll_review(self, review):
+        if review is not self.review:
+            return  # A newer review or game replaced this one
+        finished = False
+        while not review.events.empty():
+            kind, payload = review.events.get_nowait()
+            if kind == "move":
+                self.annotate_move(payload)
+            elif kind == "progress":
+                self.review_label.configure(text=f"Reviewing: {payload[0]}/{payload[1]} positions")
+            elif kind == "error":
+                self.review_label.configure(text=f"Review failed: {payload}")
+            elif kind == "done":
+                finished = True
+        if finished:
+            if not review.cancelled:
+                self.review_label.configure(text=self.review_summary())
+            self.review = None
+            self.analyze_position()
+            return
+        self.root.after(100, self.poll_review, review)
+
+    def annotate_move(self, review):
+        self.move_reviews[review.ply] = review
+
+        # Keep the verdict in the PGN so it survives export
+        node = self.review_nodes[review.ply]
+        node.nags = {review.nag} if review.nag else set()
+        # Added to what the comment already holds (e.g. imported [%clk] or [%eval]), replacing
+        # only the note of an earlier review
+        comment = REVIEW_NOTE.sub("", node.comment).strip()
+        if review.label and review.best_san:
+            comment = f"{comment} Best was {review.best_san} (-{review.loss / 100:.2f})".strip()
+        node.comment = comment
+
+        if review.label:
+            self.move_list.annotate(review.ply, review.label, REVIEW_COLORS[review.label])
+        if review.ply == self.current_move_index:
+            self.show_move_review()
+
+    def review_summary(self):
+        counts = {label: 0 for label in REVIEW_COLORS}
+        for review in self.move_reviews.values():
+            if review.label:
+                counts[review.label] += 1
+        return (
+            f"Review: {counts['?!']} inaccuracies, {counts['?']} mistakes, {counts['??']} blunders"
+        )
+
+    def pause(self):
+        # Hidden behind another screen: the engine has nobody to report to
+        self.paused = True
+        self.live_analysis.stop()
+
+    def resume(self):
+        self.paused = False
+        self.analyze_position()
+
+    def on_destroy(self, event):
+        self.live_analysis.close()
+        if self.review:
+            self.review.cancel()
+        self.close_database()
+
     def on_canvas_resize(self, event):
-        new_size = min(event.width, event.height) // 8
+        # Dragging the window fires this for every intermediate size; only render the last one
+        if self.resize_timer is not None:
+            self.root.after_cancel(self.resize_timer)
+        self.resize_timer = self.root.after(RESIZE_DELAY, self.resize_board, event.width, event.height)
+
+    def resize_board(self, width, height):
+        self.resize_timer = None
+        new_size = min(width, height) // 8
         if new_size != self.square_size:
             self.square_size = new_size
-            self.draw_board()
+            self.board_view.resize(new_size)
+            self.canvas.config(width=8 * new_size, height=8 * new_size)
 
     def on_square_hover(self, event):
-        col = event.x // self.square_size
-        row = 7 - (event.y // self.square_size)
-        square = chess.square(col, row) if (0 <= col < 8 and 0 <= row < 8) else None
+        square = self.board_view.square_at(event.x, event.y)
         if self.hover_square != square:
             self.hover_square = square
-            self.draw_board()
+            self.update_board_view()
 
     def export_pgn(self):
         from export_dialog import ExportDialog
@@ -514,7 +765,69 @@ class ModernChessGUI:
 
     def import_pgn(self):
         from import_dialog import ImportDialog
-        ImportDialog(self.root, self.load_pgn)
+        ImportDialog(self.root, self.load_game, on_database=self.set_database)
+
+    def set_database(self, database):
+        # The position index is built in the background the first time a file is opened
+        self.close_database()
+        self.database = database
+        self.position_search = PositionSearch(database)
+        self.position_search.start()
+        self.explorer = OpeningExplorer(database)
+        self.explorer.start()
+        self.poll_explorer(self.explorer)
+
+    def poll_explorer(self, explorer):
+        if explorer is not self.explorer:
+            return  # Another database replaced this one
+        self.update_explorer()
+        if not explorer.ready.is_set():
+            self.root.after(500, self.poll_explorer, explorer)
+
+    def update_explorer(self):
+        if not self.explorer:
+            return
+        self.explorer_listbox.delete(0, "end")
+        self.explorer_moves = []
+        if not self.explorer.ready.is_set():
+            done, total = self.explorer.progress
+            self.explorer_listbox.insert("end", f"Building explorer... {done:,}/{total:,} games")
+            return
+        if self.explorer.error:
+            self.explorer_listbox.insert("end", f"Error: {self.explorer.error}")
+            return
+
+        self.explorer_moves = self.explorer.moves(self.board)
+        if not self.explorer_moves:
+            self.explorer_listbox.insert("end", "No games from this position")
+        for entry in self.explorer_moves:
+            rating = entry.average_rating if entry.average_rating is not None else "-"
+            self.explorer_listbox.insert(
+                "end", f"{entry.san:<8}{entry.games:>9,}{entry.score:>6.0f}%{rating:>6}"
+            )
+
+    def on_explorer_select(self, event):
+        selection = self.explorer_listbox.curselection()
+        if selection and selection[0] < len(self.explorer_moves):
+            self.make_move(self.explorer_moves[selection[0]].move)
+
+    def close_database(self):
+        if self.explorer:
+            self.explorer.close()
+            self.explorer = None
+        if self.position_search:
+            self.position_search.close()
+            self.position_search = None
+        if self.database:
+            self.database.close()
+            self.database = None
+
+    def find_games(self):
+        if not self.position_search:
+            self.review_label.configure(text="Open a PGN file with Import PGN to search it")
+            return
+        from search_dialog import SearchDialog
+        SearchDialog(self.root, self.position_search, self.board, self.load_game)
 
     def load_pgn(self, pgn_text):
         try:
@@ -528,23 +841,34 @@ class ModernChessGUI:
             new_game = chess.pgn.read_game(pgn_io)
             if new_game is None:
                 return
+            self.load_game(new_game)
             
+        except Exception as e:
+            print(f"Error importing PGN: {str(e)}")
+
+    def load_game(self, new_game):
+        try:
             # Reset the current game state
+            if self.review:
+                self.review.cancel()
+                self.review = None
+            self.review_label.configure(text="")
+            self.move_reviews = {}
+            self.review_detail_label.configure(text="")
+            self.move_list.clear()
             self.game = new_game
-            self.board = chess.Board()
-            self.node = self.game
-            self.current_move_index = -1
-            
-            # Play through all moves to get to the final position
-            for move in self.game.mainline_moves():
-                self.board.push(move)
-                self.node = self.node.variation(0)
-                self.current_move_index += 1
+            self.position_index = PositionIndex.from_game(self.game)
+
+            # Jump straight to the final position
+            self.current_move_index = len(self.position_index) - 1
+            self.board = self.position_index.board_at(len(self.position_index))
+            self.node = self.position_index.nodes[-1]
             
             # Update displays
             self.draw_board()
             self.update_pgn_display()
             self.analyze_position()
+            self.update_explorer()
             
         except Exception as e:
             print(f"Error importing PGN: {str(e)}")
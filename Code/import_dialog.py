@@ -1,38 +1,66 @@
 import customtkinter as ctk
 import chess.pgn
 import io
+import os
+from tkinter import Listbox, filedialog
+
+from pgn_database import PgnDatabase
 
 class ImportDialog:
-    def __init__(self, parent, callback):
+    def __init__(self, parent, callback, on_database=None):
         self.window = ctk.CTkToplevel(parent)
         self.window.title("Import PGN")
         self.window.geometry("600x400")
         self.parent = parent
-        self.callback = callback
+        self.callback = callback  # Called with the chosen chess.pgn.Game
+        self.database = None  # PgnDatabase once a file is opened
+        self.on_database = on_database  # Takes over opened databases, which then outlive the dialog
+        self.page = 0
+        self.shown_count = 0  # games on the page currently listed
         self.window.transient(parent)
         self.window.grab_set()
         self.window.protocol("WM_DELETE_WINDOW", self.on_close)
-        
+
         self.main_container = ctk.CTkFrame(self.window, fg_color="transparent")
         self.main_container.pack(fill="both", expand=True, padx=20, pady=20)
-        
-        instruction_label = ctk.CTkLabel(
+
+        self.instruction_label = ctk.CTkLabel(
             self.main_container,
             text="Paste your PGN text below:",
             font=ctk.CTkFont(family="Segoe UI", size=14, weight="bold")
         )
-        instruction_label.pack(pady=(0, 10), anchor="w")
-        
+        self.instruction_label.pack(pady=(0, 10), anchor="w")
+
         self.pgn_text = ctk.CTkTextbox(
             self.main_container,
             font=ctk.CTkFont(family="Segoe UI", size=12),
             wrap="none"
         )
         self.pgn_text.pack(fill="both", expand=True)
-        
+
+        # Game list for PGN files, shown instead of the text box once a file is opened
+        self.list_frame = ctk.CTkFrame(self.main_container, fg_color="transparent")
+        self.game_listbox = Listbox(
+            self.list_frame,
+            font=("Segoe UI", 11),
+            selectmode="single",
+            exportselection=False,
+            bg="#2b2b2b",
+            fg="white"
+        )
+        self.game_listbox.pack(fill="both", expand=True)
+        self.game_listbox.bind("<Double-Button-1>", lambda event: self.validate_and_import())
+
+        page_frame = ctk.CTkFrame(self.list_frame, fg_color="transparent")
+        page_frame.pack(fill="x", pady=(5, 0))
+        ctk.CTkButton(page_frame, text="<", width=40, command=lambda: self.show_page(self.page - 1)).pack(side="left")
+        ctk.CTkButton(page_frame, text=">", width=40, command=lambda: self.show_page(self.page + 1)).pack(side="left", padx=(5, 0))
+        self.page_label = ctk.CTkLabel(page_frame, text="", font=ctk.CTkFont(family="Segoe UI", size=12))
+        self.page_label.pack(side="left", padx=(10, 0))
+
         button_frame = ctk.CTkFrame(self.main_container, fg_color="transparent")
         button_frame.pack(fill="x", pady=(10, 0))
-        
+
         import_button = ctk.CTkButton(
             button_frame,
             text="Import Game",
@@ -40,7 +68,15 @@ class ImportDialog:
             command=self.validate_and_import
         )
         import_button.pack(side="left", padx=(0, 10))
-        
+
+        open_button = ctk.CTkButton(
+            button_frame,
+            text="Open File...",
+            width=120,
+            command=self.open_file
+        )
+        open_button.pack(side="left", padx=(0, 10))
+
         cancel_button = ctk.CTkButton(
             button_frame,
             text="Cancel",
@@ -57,7 +93,74 @@ class ImportDialog:
         )
         self.status_label.pack(side="left", padx=(20, 0))
 
+    def open_file(self):
+        path = filedialog.askopenfilename(
+            parent=self.window,
+            title="Open PGN",
+            filetypes=[("PGN files", "*.pgn"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        if self.database and not self.on_database:
+            self.database.close()
+        self.database = PgnDatabase(path)
+        self.database.start()
+        if self.on_database:
+            self.on_database(self.database)
+        self.page = 0
+        self.shown_count = -1
+
+        self.instruction_label.configure(text=os.path.basename(path))
+        self.pgn_text.pack_forget()
+        self.list_frame.pack(fill="both", expand=True)
+        self.window.after(100, self.poll_index, self.database)
+
+    def poll_index(self, database):
+        if database is not self.database:
+            return  # Another file was opened
+        indexed = database.indexed.is_set()
+        if database.error:
+            self.status_label.configure(text=f"Error: {database.error}")
+        elif indexed:
+            self.status_label.configure(text=f"{len(database):,} games")
+        else:
+            self.status_label.configure(text=f"Indexing... {len(database):,} games")
+
+        # Fill the current page as soon as its games have been found
+        if self.shown_count < database.page_size and self.shown_count != len(database):
+            self.show_page(self.page)
+        else:
+            self.update_page_label()
+        if not indexed:
+            self.window.after(200, self.poll_index, database)
+
+    def show_page(self, page):
+        count = len(self.database)
+        last_page = max(0, (count - 1) // self.database.page_size)
+        self.page = max(0, min(page, last_page))
+        start = self.page * self.database.page_size
+        end = min(start + self.database.page_size, count)
+
+        self.game_listbox.delete(0, "end")
+        for number in range(start, end):
+            headers = self.database.headers(number)
+            self.game_listbox.insert(
+                "end",
+                f"{number + 1}. {headers.get('White', '?')} - {headers.get('Black', '?')}  "
+                f"{headers.get('Result', '*')}  {headers.get('Date', '')}"
+            )
+        self.shown_count = end - start
+        self.update_page_label()
+
+    def update_page_label(self):
+        pages = max(1, -(-len(self.database) // self.database.page_size))
+        self.page_label.configure(text=f"Page {self.page + 1} of {pages:,}")
+
     def validate_and_import(self):
+        if self.database:
+            self.import_selected_game()
+            return
+
         pgn_content = self.pgn_text.get("1.0", "end-1c").strip()
         if not pgn_content:
             self.status_label.configure(text="Please paste a PGN game first")
@@ -69,11 +172,29 @@ class ImportDialog:
             if game is None:
                 self.status_label.configure(text="Invalid PGN format")
                 return
-            self.callback(pgn_content)
+            self.callback(game)
+            self.on_close()
+        except Exception as e:
+            self.status_label.configure(text=f"Error: {str(e)}")
+
+    def import_selected_game(self):
+        selection = self.game_listbox.curselection()
+        if not selection:
+            self.status_label.configure(text="Please select a game first")
+            return
+
+        try:
+            game = self.database.game(self.page * self.database.page_size + selection[0])
+            if game is None:
+                self.status_label.configure(text="Invalid PGN format")
+                return
+            self.callback(game)
             self.on_close()
         except Exception as e:
             self.status_label.configure(text=f"Error: {str(e)}")
 
     def on_close(self):
+        if self.database and not self.on_database:
+            self.database.close()
         self.window.grab_release()
         self.window.destroy()
@@ -0,0 +1,107 @@
+import threading
+
+from engine_pool import engine_pool
+
+
+class LiveAnalysis:
+    """Runs an open-ended engine search off the Tk thread.
+
+    The worker keeps only the latest engine info; a Tk timer picks it up every
+    `interval` ms, so the UI is refreshed at a bounded rate however fast the
+    engine reports. With `multipv` above 1 the engine searches the best k
+    moves at once and on_update gets one info dict per line, best first.
+    Starting a new search (or calling stop) cancels the previous one straight
+    away.
+    """
+
+    def __init__(self, root, on_update, on_error=None, interval=100):
+        self.root = root
+        self.on_update = on_update
+        self.on_error = on_error
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._worker_lock = threading.Lock()  # one search per LiveAnalysis at a time
+        self._generation = 0
+        self._search = None
+        self._latest = None  # (generation, info) waiting to be shown
+        self._error = None
+        self._closed = False
+
+        self.root.after(self.interval, self._poll)
+
+    def start(self, board, engine_path, options=None, multipv=1):
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._cancel_search()
+            self._latest = None
+        threading.Thread(
+            target=self._run,
+            args=(generation, board.copy(), engine_path, options, multipv),
+            daemon=True
+        ).start()
+
+    def stop(self):
+        with self._lock:
+            self._generation += 1
+            self._cancel_search()
+            self._latest = None
+
+    def close(self):
+        self.stop()
+        self._closed = True
+
+    def _cancel_search(self):
+        # Caller holds self._lock
+        if self._search is not None:
+            self._search.stop()
+            self._search = None
+
+    def _is_current(self, generation):
+        with self._lock:
+            return generation == self._generation
+
+    def _run(self, generation, board, engine_path, options, multipv):
+        # Wait for the previous search to hand its engine back so it gets reused
+        with self._worker_lock:
+            if not self._is_current(generation):
+                return
+            try:
+                with engine_pool.engine(engine_path, options) as engine:
+                    with engine.analysis(board, multipv=multipv) as search:
+                        with self._lock:
+                            if generation != self._generation:
+                                return
+                            self._search = search
+                        for _ in search:
+                            lines = [dict(info) for info in search.multipv if "score" in info and "pv" in info]
+                            if not lines:
+                                continue
+                            with self._lock:
+                                if generation != self._generation:
+                                    break
+                                self._latest = (generation, lines)
+            except Exception as e:
+                with self._lock:
+                    if generation == self._generation:
+                        self._error = (generation, str(e))
+            finally:
+                with self._lock:
+                    if generation == self._generation:
+                        self._search = None
+
+    def _poll(self):
+        if self._closed:
+            return
+        with self._lock:
+            latest, self._latest = self._latest, None
+            error, self._error = self._error, None
+            generation = self._generation
+
+        if latest is not None and latest[0] == generation:
+            self.on_update(latest[1])
+        if error is not None and error[0] == generation and self.on_error:
+            self.on_error(error[1])
+
+        self.root.after(self.interval, self._poll)
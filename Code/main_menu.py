@@ -1,94 +1,165 @@
-import chess
-import customtkinter as ctk
-
-from Code.analysis import display_chess_board
-from Code.battle_arena import start_battle_arena  # Import the new Battle Arena function
-from Code.play_bot import play_bot_game  # Import the Play Bot Game function
-
+import sys
+import threading
+import time
 
-def main_menu():
-    def start_engine_analysis():
-        root.destroy()
-        starting_position = chess.STARTING_FEN
-        display_chess_board(starting_position)
+# Taken before anything heavy is imported, so the startup time covers the imports too
+STARTED = time.perf_counter()
 
-    def open_battle_arena():
-        root.destroy()
-        start_battle_arena()  # Call the Battle Arena function
+import customtkinter as ctk
 
-    def play_against_bot():
-        root.destroy()
-        play_bot_game()  # Call the Play Bot Game function
+from engine_pool import engine_pool
+from engine_registry import engine_registry
+
+MENU = "menu"
+ANALYSIS = "analysis"
+BOT = "bot"
+ARENA = "arena"
+
+# Window title and size of every screen; None lets the window fit the screen's widgets
+SCREENS = {
+    MENU: ("Chess Toolkit", "800x600"),
+    ANALYSIS: ("Chess Analysis", None),
+    BOT: ("Play Against Bot", "1000x800"),
+    ARENA: ("Chess Engine Battle Arena", "1200x900"),
+}
+
+
+class ChessToolkit:
+    """The main menu and every screen, swapped inside one root window.
+
+    A screen's module is imported and its widgets built the first time it is
+    opened. Leaving a screen only hides it, so going back is instant and what
+    it holds (the game on the board, a running match, warm engines) survives.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.screens = {}  # name -> frame, for every screen opened so far
+        self.current = None
+        self.analysis = None  # ModernChessGUI, once the analysis screen exists
+        self.builders = {
+            MENU: self.build_menu,
+            ANALYSIS: self.build_analysis,
+            BOT: self.build_bot,
+            ARENA: self.build_arena,
+        }
+
+    def show(self, name):
+        if name == self.current:
+            return
+        if self.current == ANALYSIS:
+            self.analysis.pause()
+        if self.current is not None:
+            self.screens[self.current].pack_forget()
+
+        if name not in self.screens:
+            frame = ctk.CTkFrame(self.root, corner_radius=0, fg_color="transparent")
+            self.builders[name](frame)
+            self.screens[name] = frame
+        title, geometry = SCREENS[name]
+        self.root.title(title)
+        self.root.geometry(geometry or "")
+        self.screens[name].pack(fill="both", expand=True)
+        self.current = name
+
+        if name == ANALYSIS:
+            self.analysis.resume()
+
+    def show_menu(self):
+        self.show(MENU)
+
+    def open_analysis(self, game):
+        self.show(ANALYSIS)
+        self.analysis.load_game(game)
+
+    def build_menu(self, parent):
+        content_frame = ctk.CTkFrame(parent, corner_radius=15)
+        content_frame.pack(fill="both", expand=True, padx=20, pady=20)
+
+        # App logo/title
+        title_label = ctk.CTkLabel(
+            content_frame,
+            text="Chess Toolkit",
+            font=ctk.CTkFont(family="Segoe UI", size=36, weight="bold")
+        )
+        title_label.pack(pady=(50, 30))
+
+        for text, screen in (
+            ("Engine Analysis", ANALYSIS),
+            ("Play Against Bot", BOT),
+            ("Battle Arena (Bot Vs Bot)", ARENA),
+        ):
+            ctk.CTkButton(
+                content_frame,
+                text=text,
+                font=ctk.CTkFont(family="Segoe UI", size=18),
+                height=50,
+                width=250,
+                corner_radius=10,
+                command=lambda screen=screen: self.show(screen)
+            ).pack(pady=20)
+
+        # Credits text
+        credits_label = ctk.CTkLabel(
+            content_frame,
+            text="Chess Toolkit v1.0",
+            font=ctk.CTkFont(family="Segoe UI", size=12),
+            text_color="gray70"
+        )
+        credits_label.pack(side="bottom", pady=10)
+
+    def build_analysis(self, parent):
+        import chess
+        from gui import ModernChessGUI
+
+        self.analysis = ModernChessGUI(parent, chess.STARTING_FEN)
+        back_button = ctk.CTkButton(
+            self.analysis.main_container, text="Back", command=self.show_menu, corner_radius=10
+        )
+        back_button.pack(side="bottom", pady=10)
+
+    def build_bot(self, parent):
+        from play_bot import play_bot_game
+
+        play_bot_game(parent, on_back=self.show_menu, on_analysis=self.open_analysis)
+
+    def build_arena(self, parent):
+        from battle_arena import BattleArena
+
+        BattleArena(parent, on_back=self.show_menu)
+
+
+def warm_up():
+    # Background thread: any engine handshakes happen here rather than before the menu shows
+    engine_registry.probe_all()
+    default_engine = engine_registry.default
+    engine_pool.prewarm(engine_registry.path(default_engine), engine_registry.options(default_engine))
+
+
+def main_menu(report_startup=False):
+    # Warm up the engines while the user is still choosing a screen
+    threading.Thread(target=warm_up, daemon=True).start()
 
     # Set appearance mode and default color theme
     ctk.set_appearance_mode("dark")
     ctk.set_default_color_theme("blue")
 
-    # Create the root window
     root = ctk.CTk()
-    root.title("Chess Toolkit")
-    root.geometry("800x600")
-
-    # Create a frame for the content
-    content_frame = ctk.CTkFrame(root, corner_radius=15)
-    content_frame.pack(fill="both", expand=True, padx=20, pady=20)
-
-    # App logo/title
-    title_label = ctk.CTkLabel(
-        content_frame,
-        text="Chess Toolkit",
-        font=ctk.CTkFont(family="Segoe UI", size=36, weight="bold")
-    )
-    title_label.pack(pady=(50, 30))
-
-    # Engine analysis button
-    engine_analysis_button = ctk.CTkButton(
-        content_frame,
-        text="Engine Analysis",
-        font=ctk.CTkFont(family="Segoe UI", size=18),
-        height=50,
-        width=250,
-        corner_radius=10,
-        command=start_engine_analysis
-    )
-    engine_analysis_button.pack(pady=20)
-
-    # Play against bot button
-    play_bot_button = ctk.CTkButton(
-        content_frame,
-        text="Play Against Bot",
-        font=ctk.CTkFont(family="Segoe UI", size=18),
-        height=50,
-        width=250,
-        corner_radius=10,
-        command=play_against_bot
-    )
-    play_bot_button.pack(pady=20)
-
-    # Battle Arena button
-    battle_arena_button = ctk.CTkButton(
-        content_frame,
-        text="Battle Arena (Bot Vs Bot)",
-        font=ctk.CTkFont(family="Segoe UI", size=18),
-        height=50,
-        width=250,
-        corner_radius=10,
-        command=open_battle_arena
-    )
-    battle_arena_button.pack(pady=20)
-
-
-
-    # Credits text
-    credits_label = ctk.CTkLabel(
-        content_frame,
-        text="Chess Toolkit v1.0",
-        font=ctk.CTkFont(family="Segoe UI", size=12),
-        text_color="gray70"
-    )
-    credits_label.pack(side="bottom", pady=10)
+    toolkit = ChessToolkit(root)
+    toolkit.show(MENU)
+
+    if report_startup:
+        def report():
+            # Runs once the menu has been drawn
+            print(f"Startup: {(time.perf_counter() - STARTED) * 1000:.0f} ms", flush=True)
+            root.destroy()
+
+        root.after_idle(lambda: root.after(0, report))
 
     root.mainloop()
 
 
-main_menu()
+# Guarded so that worker processes (which re-import the main module) don't open the menu
+if __name__ == "__main__":
+    # --startup-time prints how long the menu took to appear and exits, to catch startup regressions
+    main_menu(report_startup="--startup-time" in sys.argv[1:])
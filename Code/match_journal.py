@@ -0,0 +1,84 @@
+import json
+import os
+import threading
+
+
+class MatchJournal:
+    """Crash-safe record of a match or tournament, so it can be resumed.
+
+    Every finished game is appended to the PGN file and synced to disk, then
+    the journal (the match settings, the PGN size and each pairing's results
+    by game number) is rewritten atomically. On resume the PGN is cut back to
+    the size the journal last recorded, which drops any game written after
+    the last journal update, so no game is ever counted twice. A new journal
+    starts from the PGN's current size, so games already in it are kept.
+    """
+
+    def __init__(self, path, settings, pgn_path, results=None, pgn_size=None):
+        self.path = path
+        self.settings = settings
+        self.pgn_path = pgn_path
+        self.results = results or {}  # (engine1, engine2) -> {game_num: engine1 points}
+        self.pgn_size = pgn_size  # None until a new journal is opened
+        self._lock = threading.Lock()
+        self._pgn_file = None
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        results = {
+            (entry["engine1"], entry["engine2"]): {int(num): points for num, points in entry["points"].items()}
+            for entry in data["pairings"]
+        }
+        return cls(path, data["settings"], data["pgn"], results, data["pgn_size"])
+
+    @property
+    def games(self):
+        return sum(len(points) for points in self.results.values())
+
+    def completed(self, engine1, engine2):
+        return dict(self.results.get((engine1, engine2), {}))
+
+    def open(self):
+        """Start appending games, discarding any written after the last journal update."""
+        with self._lock:
+            self._pgn_file = open(self.pgn_path, "ab")
+            if self.pgn_size is not None and self._pgn_file.tell() > self.pgn_size:
+                self._pgn_file.truncate(self.pgn_size)
+                self._pgn_file.seek(self.pgn_size)
+            self.pgn_size = self._pgn_file.tell()
+            self._save()
+
+    def record(self, engine1, engine2, game_num, points, game):
+        with self._lock:
+            self._pgn_file.write(str(game).encode("utf-8") + b"\n\n")
+            self._pgn_file.flush()
+            os.fsync(self._pgn_file.fileno())
+            self.pgn_size = self._pgn_file.tell()
+            self.results.setdefault((engine1, engine2), {})[game_num] = points
+            self._save()
+
+    def _save(self):
+        # Caller holds self._lock; write a new file and swap it in so a crash never leaves half a journal
+        data = {
+            "settings": self.settings,
+            "pgn": self.pgn_path,
+            "pgn_size": self.pgn_size,
+            "pairings": [
+                {"engine1": engine1, "engine2": engine2, "points": points}
+                for (engine1, engine2), points in self.results.items()
+            ],
+        }
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def close(self):
+        with self._lock:
+            if self._pgn_file is not None:
+                self._pgn_file.close()
+                self._pgn_file = None
@@ -0,0 +1,233 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import chess
+import chess.engine
+import chess.pgn
+
+from engine_pool import engine_pool
+
+
+def format_stats(stats):
+    return f"Engine startup: {stats['startup']:.1f}s, search: {stats['search']:.1f}s"
+
+
+def parse_time_control(text):
+    """(base, increment) in seconds from "base+increment", e.g. "10+0.1"."""
+    base, separator, increment = text.partition("+")
+    base, increment = float(base), float(increment or 0)
+    if base <= 0 or increment < 0:
+        raise ValueError(f"invalid time control {text!r}")
+    return base, increment
+
+
+def format_time_control(time_control):
+    return "{:g}+{:g}".format(*time_control)
+
+
+class MatchRunner:
+    """Plays an engine-vs-engine match, running up to `concurrency` games at once.
+
+    Engines are borrowed from the shared pool, so a process started for the
+    first game keeps playing for the rest of the match; only the colours it is
+    assigned change. With a `time_control` of (base, increment) seconds each
+    side has a clock, charged with the wall time of every engine.play() call
+    including the UCI round trip, and a side whose clock runs out loses on
+    time; otherwise every move gets `time_per_move`. An `adjudicator` may end
+    a game early from the engines' scores or tablebases. `options` maps an
+    engine name to the UCI options it plays with. Finished games are reported
+    through on_game_finished in the order they complete, from the thread that
+    called run(). Games listed in `completed` (game number -> engine 1
+    points, e.g. from a MatchJournal) count towards the score but are not
+    played again.
+    """
+
+    def __init__(self, engine1_name, engine1_path, engine2_name, engine2_path,
+                 num_games=10, time_per_move=1.0, concurrency=1, time_control=None, adjudicator=None,
+                 options=None, openings=None, on_move=None, on_game_finished=None, completed=None):
+        self.engine1_name = engine1_name
+        self.engine1_path = engine1_path
+        self.engine2_name = engine2_name
+        self.engine2_path = engine2_path
+        self.num_games = num_games
+        self.time_per_move = time_per_move
+        self.concurrency = max(1, concurrency)
+        self.time_control = time_control  # (base, increment) seconds, or None for a fixed time per move
+        self.adjudicator = adjudicator
+        self.options = options or {}
+        self.openings = openings  # OpeningSuite, or None to start every game from the initial position
+        self.on_move = on_move
+        self.on_game_finished = on_game_finished
+
+        self.completed = dict(completed or {})
+        self.score = {"engine1": 0, "engine2": 0, "draws": 0}
+        for points in self.completed.values():
+            self.score[{1.0: "engine1", 0.5: "draws", 0.0: "engine2"}[points]] += 1
+        self.games = []  # finished games, in completion order
+        self.stats = {"startup": 0.0, "search": 0.0}  # seconds, summed over all games
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def run(self):
+        try:
+            self._run()
+        finally:
+            # Concurrent games started an engine pair each; keep one of each warm
+            for name, path in ((self.engine1_name, self.engine1_path), (self.engine2_name, self.engine2_path)):
+                engine_pool.drain(path, self.options.get(name), keep=1)
+
+    def _run(self):
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [
+                executor.submit(self.play_game, game_num) for game_num in range(1, self.num_games + 1)
+                if game_num not in self.completed
+            ]
+            try:
+                for future in as_completed(futures):
+                    game_num, game, winner = future.result()
+                    if winner is None:
+                        continue  # Stopped before the game finished
+                    self.score[winner] += 1
+                    self.games.append(game)
+                    if self.on_game_finished:
+                        self.on_game_finished(game_num, game)
+            except BaseException:
+                # Don't leave the other games running after a failure
+                self.stop()
+                raise
+
+    def play_game(self, game_num):
+        if self.stopped:
+            return game_num, None, None
+
+        # Engine 1 plays White in odd games
+        engine1_white = game_num % 2 == 1
+        white_name, black_name = self.engine1_name, self.engine2_name
+        white_path, black_path = self.engine1_path, self.engine2_path
+        if not engine1_white:
+            white_name, black_name = black_name, white_name
+            white_path, black_path = black_path, white_path
+
+        board = self.starting_board(game_num)
+        game = chess.pgn.Game.from_board(board)
+        game.headers["Event"] = "Engine Battle"
+        game.headers["Date"] = datetime.now().strftime("%Y.%m.%d")
+        game.headers["White"] = white_name
+        game.headers["Black"] = black_name
+        game.headers["Round"] = str(game_num)
+
+        if self.time_control:
+            game.headers["TimeControl"] = format_time_control(self.time_control)
+
+        result = None
+        started = time.monotonic()
+        white_options, black_options = self.options.get(white_name), self.options.get(black_name)
+        with engine_pool.engine(white_path, white_options) as white, \
+                engine_pool.engine(black_path, black_options) as black:
+            for engine in (white, black):
+                self.prepare_engine(engine)
+            self.add_stat("startup", time.monotonic() - started)
+
+            node = game.end()
+            if self.on_move:
+                self.on_move(game_num, board, game)
+
+            scores = []  # White score reported with every move, for adjudication
+            clocks = {chess.WHITE: 0.0, chess.BLACK: 0.0}
+            if self.time_control:
+                clocks = {chess.WHITE: self.time_control[0], chess.BLACK: self.time_control[0]}
+            while not board.is_game_over() and not self.stopped:
+                engine = white if board.turn == chess.WHITE else black
+                searched = time.monotonic()
+                # Passing the game lets python-chess send ucinewgame when it changes
+                played = engine.play(board, self.search_limit(clocks), game=game, info=chess.engine.INFO_SCORE)
+                elapsed = time.monotonic() - searched
+                self.add_stat("search", elapsed)
+
+                if self.time_control:
+                    clocks[board.turn] -= elapsed
+                    if clocks[board.turn] < 0:
+                        result = self.time_forfeit(board, game)
+                        break
+                    clocks[board.turn] += self.time_control[1]
+                board.push(played.move)
+                node = node.add_variation(played.move)
+                if self.time_control:
+                    node.set_clock(clocks[not board.turn])
+                if self.on_move:
+                    self.on_move(game_num, board, game)
+
+                if self.adjudicator and not board.is_game_over():
+                    scores.append(self.adjudicator.white_score(played.info))
+                    adjudication = self.adjudicator.adjudicate(board, scores)
+                    if adjudication:
+                        result, node.comment = adjudication
+                        game.headers["Termination"] = "adjudication"
+                        break
+
+        if result is None:
+            if not board.is_game_over():
+                game.headers["Result"] = "*"
+                return game_num, game, None
+            result = board.result()
+
+        game.headers["Result"] = result
+        if result == "1/2-1/2":
+            winner = "draws"
+        else:
+            winner = "engine1" if (result == "1-0") == engine1_white else "engine2"
+        return game_num, game, winner
+
+    def search_limit(self, clocks):
+        if not self.time_control:
+            return chess.engine.Limit(time=self.time_per_move)
+        increment = self.time_control[1]
+        return chess.engine.Limit(
+            white_clock=clocks[chess.WHITE],
+            black_clock=clocks[chess.BLACK],
+            white_inc=increment,
+            black_inc=increment
+        )
+
+    @staticmethod
+    def time_forfeit(board, game):
+        """Result when the side to move has run out of time."""
+        game.headers["Termination"] = "time forfeit"
+        # The opponent only wins if it could still deliver mate
+        if board.has_insufficient_material(not board.turn):
+            return "1/2-1/2"
+        return "0-1" if board.turn == chess.WHITE else "1-0"
+
+    def starting_board(self, game_num):
+        # Games 2n - 1 and 2n share an opening with colours reversed
+        if self.openings is None:
+            return chess.Board()
+        return self.openings.board((game_num - 1) // 2)
+
+    @staticmethod
+    def engine1_points(game_num, game):
+        """Points engine 1 scored in a finished game."""
+        points = {"1-0": 1.0, "0-1": 0.0, "1/2-1/2": 0.5}[game.headers["Result"]]
+        return points if game_num % 2 == 1 else 1.0 - points
+
+    @staticmethod
+    def prepare_engine(engine):
+        # Start every game from an empty hash table, as a fresh process would
+        if "Clear Hash" in engine.options:
+            engine.configure({"Clear Hash": None})
+
+    def add_stat(self, name, seconds):
+        with self._stats_lock:
+            self.stats[name] += seconds
+
+    def stats_summary(self):
+        return format_stats(self.stats)
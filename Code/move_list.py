@@ -0,0 +1,79 @@
+class MoveList:
+    """Two-column (White / Black) move listboxes updated one move at a time.
+
+    The SAN already shown is remembered, so sync() with a game that grew by
+    one move inserts a single entry instead of rebuilding the whole list.
+    """
+
+    def __init__(self, white_listbox, black_listbox, default_color="white"):
+        self.white_listbox = white_listbox
+        self.black_listbox = black_listbox
+        self.default_color = default_color
+        self._sans = []
+        self._labels = {}  # ply -> (suffix, colour)
+
+    def __len__(self):
+        return len(self._sans)
+
+    def _listbox(self, ply):
+        return self.white_listbox if ply % 2 == 0 else self.black_listbox
+
+    def _text(self, ply):
+        san = self._sans[ply]
+        suffix, _ = self._labels.get(ply, ("", None))
+        return f"{(ply // 2) + 1}. {san}{suffix}" if ply % 2 == 0 else f"{san}{suffix}"
+
+    def append(self, san):
+        ply = len(self._sans)
+        self._sans.append(san)
+        listbox = self._listbox(ply)
+        listbox.insert("end", self._text(ply))
+        if ply in self._labels:
+            listbox.itemconfig(ply // 2, fg=self._labels[ply][1])
+
+    def truncate(self, plies):
+        if plies >= len(self._sans):
+            return
+        del self._sans[plies:]
+        self._labels = {ply: label for ply, label in self._labels.items() if ply < plies}
+        self.white_listbox.delete((plies + 1) // 2, "end")
+        self.black_listbox.delete(plies // 2, "end")
+
+    def clear(self):
+        self._labels = {}
+        self.truncate(0)
+
+    def sync(self, sans):
+        # Keep the longest common prefix; normally that is everything already shown
+        keep = 0
+        for shown, san in zip(self._sans, sans):
+            if shown != san:
+                break
+            keep += 1
+        self.truncate(keep)
+        for san in sans[keep:]:
+            self.append(san)
+
+    def annotate(self, ply, suffix="", color=None):
+        if suffix or color:
+            self._labels[ply] = (suffix, color or self.default_color)
+        else:
+            self._labels.pop(ply, None)
+        if ply >= len(self._sans):
+            return  # Applied when the move is appended
+
+        listbox = self._listbox(ply)
+        index = ply // 2
+        selected = index in listbox.curselection()
+        listbox.delete(index)
+        listbox.insert(index, self._text(ply))
+        listbox.itemconfig(index, fg=color or self.default_color)
+        if selected:
+            listbox.selection_set(index)
+
+    def select(self, ply):
+        self.white_listbox.selection_clear(0, "end")
+        self.black_listbox.selection_clear(0, "end")
+        if 0 <= ply < len(self._sans):
+            self._listbox(ply).selection_set(ply // 2)
+            self._listbox(ply).see(ply // 2)
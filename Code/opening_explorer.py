@@ -0,0 +1,241 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+
+import chess
+import chess.pgn
+
+from eval_cache import CACHE_DIR
+from position_search import position_key
+
+ExplorerMove = namedtuple("ExplorerMove", "move san games white draws black score average_rating")
+
+RESULT_COLUMNS = {"1-0": (1, 0, 0), "1/2-1/2": (0, 1, 0), "0-1": (0, 0, 1)}
+
+
+class OpeningCollector(chess.pgn.BaseVisitor):
+    """PGN visitor that keeps the opening moves of a game with its result and ratings.
+
+    Moves after `max_plies` are not even parsed, which is most of the cost of
+    reading a game.
+    """
+
+    def __init__(self, max_plies):
+        self.max_plies = max_plies
+
+    def begin_game(self):
+        self.headers = {}
+        self.moves = []  # (position key, uci)
+
+    def visit_header(self, tagname, tagvalue):
+        if tagname in ("Result", "WhiteElo", "BlackElo"):
+            self.headers[tagname] = tagvalue
+
+    def begin_variation(self):
+        return chess.pgn.SKIP
+
+    def begin_parse_san(self, board, san):
+        if len(self.moves) >= self.max_plies:
+            return chess.pgn.SKIP
+
+    def visit_move(self, board, move):
+        self.moves.append((position_key(board), move.uci()))
+
+    def result(self):
+        return self
+
+
+class OpeningExplorer:
+    """Move statistics per position for the opening phase of a PGN database.
+
+    Counts, results and rating totals for every (position, move) pair in the
+    first `max_plies` plies are aggregated once into SQLite, so looking up a
+    position is a single indexed query. The table remembers how many games it
+    covers and the size, mtime and last bytes of the file it read them from:
+    update() only reads games appended since then, and starts over if the
+    file was changed in any other way.
+    """
+
+    def __init__(self, database, max_plies=30, batch_games=5000):
+        self.database = database
+        self.max_plies = max_plies
+        self.batch_games = batch_games
+        key = hashlib.sha1(os.path.abspath(database.path).encode()).hexdigest()[:16]
+        self.path = os.path.join(CACHE_DIR, f"explorer-{key}.sqlite3")
+
+        self.progress = (0, 0)  # (games added, games) while updating
+        self.error = None
+        self.ready = threading.Event()
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _connect(self):
+        # Caller holds self._lock
+        if self._db is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS moves ("
+                "position INTEGER NOT NULL, move TEXT NOT NULL, games INTEGER NOT NULL, "
+                "white INTEGER NOT NULL, draws INTEGER NOT NULL, black INTEGER NOT NULL, "
+                "rating_sum INTEGER NOT NULL, rated INTEGER NOT NULL, "
+                "PRIMARY KEY (position, move)) WITHOUT ROWID"
+            )
+            self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+        return self._db
+
+    def _meta(self, key):
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def start(self):
+        """Bring the table up to date with the database in the background."""
+        threading.Thread(target=self._update, daemon=True).start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _update(self):
+        try:
+            self.update()
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.ready.set()
+
+    def update(self):
+        self.database.indexed.wait()
+        if self.database.error:
+            raise ValueError(self.database.error)
+
+        with self._lock:
+            done = self._meta("games")
+            if done and not self._appended_only():
+                # The file was rewritten rather than appended to
+                with self._connect() as db:
+                    db.execute("DELETE FROM moves")
+                done = 0
+
+        total = len(self.database)
+        self.progress = (done, total)
+        with open(self.database.path, encoding="utf-8-sig", errors="replace") as f:
+            if done < total:
+                f.seek(self.database.offset(done))
+            while done < total and not self._cancelled.is_set():
+                count = min(self.batch_games, total - done)
+                collectors = []
+                for _ in range(count):
+                    collector = chess.pgn.read_game(f, Visitor=lambda: OpeningCollector(self.max_plies))
+                    if collector is None:
+                        break
+                    collectors.append(collector)
+                self._add(collectors, done + count)
+                done += count
+                self.progress = (done, total)
+
+    def _appended_only(self):
+        # Caller holds self._lock; true if the part of the file already counted is unchanged
+        stat = os.stat(self.database.path)
+        size = self._meta("size")
+        if stat.st_size == size:
+            return stat.st_mtime_ns == self._meta("mtime")
+        return stat.st_size > size and self._tail(size) == self._meta("tail")
+
+    def _tail(self, size, length=4096):
+        # Fingerprint of the last bytes before `size`, where a rewrite would almost surely differ
+        with open(self.database.path, "rb") as f:
+            f.seek(max(0, size - length))
+            data = f.read(min(size, length))
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little") - 2 ** 63
+
+    def _add(self, collectors, games):
+        with self._lock:
+            if not self._cancelled.is_set():
+                self._store(collectors, games)
+
+    def _store(self, collectors, games):
+        # Caller holds self._lock; aggregate in memory first so each pair is written once per batch
+        totals = {}
+        for collector in collectors:
+            results = RESULT_COLUMNS.get(collector.headers.get("Result"))
+            if results is None:
+                continue  # Unfinished games say nothing about the moves
+            rating, rated = self._rating(collector.headers)
+            for key, uci in collector.moves:
+                entry = totals.setdefault((key - 2 ** 63, uci), [0, 0, 0, 0, 0, 0])
+                entry[0] += 1
+                entry[1] += results[0]
+                entry[2] += results[1]
+                entry[3] += results[2]
+                entry[4] += rating
+                entry[5] += rated
+
+        db = self._connect()
+        with db:
+            db.executemany(
+                "INSERT INTO moves VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (position, move) DO UPDATE SET "
+                "games = games + excluded.games, white = white + excluded.white, "
+                "draws = draws + excluded.draws, black = black + excluded.black, "
+                "rating_sum = rating_sum + excluded.rating_sum, rated = rated + excluded.rated",
+                [key + tuple(entry) for key, entry in totals.items()]
+            )
+            # Saved with the moves, so an interrupted update resumes where it stopped
+            stat = os.stat(self.database.path)
+            db.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                [("games", games), ("size", stat.st_size), ("mtime", stat.st_mtime_ns),
+                 ("tail", self._tail(stat.st_size))]
+            )
+
+    @staticmethod
+    def _rating(headers):
+        ratings = []
+        for tag in ("WhiteElo", "BlackElo"):
+            try:
+                ratings.append(int(headers.get(tag, "")))
+            except ValueError:
+                pass
+        if not ratings:
+            return 0, 0
+        return sum(ratings) // len(ratings), 1
+
+    def moves(self, board):
+        """ExplorerMove for every move played from `board`, most played first.
+
+        The score is the percentage scored by the side to move.
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT move, games, white, draws, black, rating_sum, rated FROM moves "
+                "WHERE position = ? ORDER BY games DESC",
+                (position_key(board) - 2 ** 63,)
+            ).fetchall()
+
+        moves = []
+        for uci, games, white, draws, black, rating_sum, rated in rows:
+            move = chess.Move.from_uci(uci)
+            if not board.is_legal(move):
+                continue  # Position key collision
+            wins = white if board.turn == chess.WHITE else black
+            moves.append(ExplorerMove(
+                move=move,
+                san=board.san(move),
+                games=games,
+                white=white,
+                draws=draws,
+                black=black,
+                score=100 * (wins + draws / 2) / games,
+                average_rating=rating_sum // rated if rated else None
+            ))
+        return moves
+
+    def close(self):
+        self.cancel()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,98 @@
+import random
+import threading
+from array import array
+
+import chess
+import chess.pgn
+
+
+class OpeningSuite:
+    """Starting positions from an EPD or PGN file, read one at a time.
+
+    The file is scanned once to record where each opening starts; positions
+    are parsed only when a game asks for them, so suites of any size cost
+    eight bytes of memory per opening. Shuffling reorders those offsets in
+    place, in the same order a shuffled list of indices would have.
+    """
+
+    def __init__(self, path, shuffle=False, seed=None):
+        self.path = path
+        self.is_pgn = path.lower().endswith(".pgn")
+        self.shuffle = shuffle
+        self.seed = seed
+
+        self._lock = threading.Lock()
+        self._offsets = None
+        self._file = None
+
+    def _build_index(self):
+        # Caller holds self._lock
+        offsets = array("q")
+        if self.is_pgn:
+            with open(self.path, encoding="utf-8-sig", errors="replace") as f:
+                while True:
+                    offset = f.tell()
+                    if not chess.pgn.skip_game(f):
+                        break
+                    offsets.append(offset)
+        else:
+            with open(self.path, "rb") as f:
+                offset = 0
+                for line in f:
+                    stripped = line.strip()
+                    if stripped and not stripped.startswith(b"#"):
+                        offsets.append(offset)
+                    offset += len(line)
+        if not offsets:
+            raise ValueError(f"No openings found in {self.path}")
+
+        if self.shuffle:
+            random.Random(self.seed).shuffle(offsets)
+        self._offsets = offsets
+
+    def __len__(self):
+        with self._lock:
+            if self._offsets is None:
+                self._build_index()
+            return len(self._offsets)
+
+    def board(self, index):
+        """Board for opening number `index`, wrapping around when the suite runs out.
+
+        PGN openings come back with their moves on the move stack so engines see
+        the whole line.
+        """
+        with self._lock:
+            if self._offsets is None:
+                self._build_index()
+            offset = self._offsets[index % len(self._offsets)]
+            if self.is_pgn:
+                return self._read_pgn(offset)
+            return self._read_epd(offset)
+
+    def _read_pgn(self, offset):
+        if self._file is None:
+            self._file = open(self.path, encoding="utf-8-sig", errors="replace")
+        self._file.seek(offset)
+        game = chess.pgn.read_game(self._file)
+        board = game.board()
+        for move in game.mainline_moves():
+            board.push(move)
+        return board
+
+    def _read_epd(self, offset):
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            line = f.readline().decode("utf-8", errors="replace").strip()
+        try:
+            board, _ = chess.Board.from_epd(line)
+        except ValueError:
+            # Plain FEN lines, with move counters
+            board = chess.Board(line)
+        return board
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,121 @@
+import codecs
+import threading
+from array import array
+from collections import OrderedDict
+
+import chess.pgn
+
+
+class PgnDatabase:
+    """A PGN file of any size, indexed by the offset at which each game starts.
+
+    index() scans the file once with skip_game, which is what makes opening a
+    multi-gigabyte database cheap: only eight bytes per game stay in memory.
+    Headers are read a page at a time when the game list shows them, and a
+    game's moves are only parsed when it is opened.
+    """
+
+    def __init__(self, path, page_size=100, cached_pages=20):
+        self.path = path
+        self.page_size = page_size
+        self.cached_pages = cached_pages
+
+        self._offsets = array("q")
+        self._pages = OrderedDict()  # page number -> list of Headers
+        self._lock = threading.Lock()
+        self._file = None
+        self._raw_file = None
+        self._thread = None
+        self._cancelled = threading.Event()
+        self.indexed = threading.Event()
+        self.error = None
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _open(self):
+        return open(self.path, encoding="utf-8-sig", errors="replace")
+
+    def start(self):
+        """Build the index in the background; len() grows as games are found."""
+        self._thread = threading.Thread(target=self.index, daemon=True)
+        self._thread.start()
+
+    def index(self):
+        try:
+            with self._open() as f:
+                while not self._cancelled.is_set():
+                    offset = f.tell()
+                    if not chess.pgn.skip_game(f):
+                        break
+                    self._offsets.append(offset)
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.indexed.set()
+
+    def offset(self, number):
+        return self._offsets[number]
+
+    def headers(self, number):
+        """Headers of game `number`, read with the rest of its page."""
+        page = number // self.page_size
+        with self._lock:
+            rows = self._pages.get(page)
+            if rows is not None:
+                self._pages.move_to_end(page)
+            if rows is None or number - page * self.page_size >= len(rows):
+                # Re-read pages that were still being indexed when they were cached
+                rows = self._read_page(page)
+                self._pages[page] = rows
+                if len(self._pages) > self.cached_pages:
+                    self._pages.popitem(last=False)
+        return rows[number - page * self.page_size]
+
+    def _read_page(self, page):
+        # Caller holds self._lock
+        if self._file is None:
+            self._file = self._open()
+        start = page * self.page_size
+        end = min(start + self.page_size, len(self._offsets))
+        rows = []
+        for number in range(start, end):
+            self._file.seek(self._offsets[number])
+            rows.append(chess.pgn.read_headers(self._file))
+        return rows
+
+    def read_headers(self, number):
+        """Headers of a single game, for lookups that jump around the file."""
+        with self._lock:
+            if self._file is None:
+                self._file = self._open()
+            self._file.seek(self._offsets[number])
+            return chess.pgn.read_headers(self._file)
+
+    def raw(self, number):
+        """Bytes of game `number` exactly as they appear in the file."""
+        end = self._offsets[number + 1] if number + 1 < len(self._offsets) else None
+        with self._lock:
+            if self._raw_file is None:
+                self._raw_file = open(self.path, "rb")
+            self._raw_file.seek(self._offsets[number])
+            data = self._raw_file.read(end - self._offsets[number] if end is not None else -1)
+        if self._offsets[number] == 0 and data.startswith(codecs.BOM_UTF8):
+            data = data[len(codecs.BOM_UTF8):]
+        return data
+
+    def game(self, number):
+        """Fully parsed game `number`."""
+        with self._lock:
+            if self._file is None:
+                self._file = self._open()
+            self._file.seek(self._offsets[number])
+            return chess.pgn.read_game(self._file)
+
+    def close(self):
+        self._cancelled.set()
+        with self._lock:
+            for f in (self._file, self._raw_file):
+                if f is not None:
+                    f.close()
+            self._file = self._raw_file = None
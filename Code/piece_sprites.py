@@ -0,0 +1,126 @@
+import base64
+import os
+import tkinter
+from collections import OrderedDict
+from fractions import Fraction
+
+import chess
+
+from utils import get_piece_symbol
+
+# Optional piece set: wK.png ... bP.png, or the same names as .svg
+PIECES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pieces")
+
+# Fonts tried in order for drawing the Unicode pieces when there is no piece set
+GLYPH_FONTS = ["seguisym.ttf", "DejaVuSans-Bold.ttf", "DejaVuSans.ttf", "Arial Unicode.ttf"]
+
+
+class PieceSprites:
+    """Piece images rendered once per square size and shared by every board.
+
+    A complete piece set in pieces/ is used when present: PNGs are scaled
+    with Pillow if it is installed and by Tk otherwise, SVGs need cairosvg.
+    Without a piece set the Unicode pieces are drawn into images with Pillow.
+    When none of that is possible get() returns None and boards fall back to
+    drawing the pieces as text.
+    """
+
+    def __init__(self, pieces_dir=PIECES_DIR, max_sizes=4):
+        self.pieces_dir = pieces_dir
+        self.max_sizes = max_sizes
+        self._sizes = OrderedDict()  # square size -> {piece symbol: PhotoImage or None}
+        self._files = None
+
+    def get(self, symbol, size):
+        """PhotoImage of the piece with this symbol ("K", "p", ...) for `size` pixel squares."""
+        sprites = self._sizes.get(size)
+        if sprites is None:
+            # Boards keep their own references, so dropping an old size never blanks a board
+            sprites = self._sizes[size] = {}
+            while len(self._sizes) > self.max_sizes:
+                self._sizes.popitem(last=False)
+        else:
+            self._sizes.move_to_end(size)
+        if symbol not in sprites:
+            sprites[symbol] = self._render(symbol, size)
+        return sprites[symbol]
+
+    def _piece_files(self):
+        if self._files is None:
+            self._files = {}
+            for extension in (".svg", ".png"):
+                files = {}
+                for symbol in "KQRBNPkqrbnp":
+                    name = ("w" if symbol.isupper() else "b") + symbol.upper() + extension
+                    path = os.path.join(self.pieces_dir, name)
+                    if os.path.isfile(path):
+                        files[symbol] = path
+                if len(files) == 12:
+                    self._files = files
+                    break
+        return self._files
+
+    def _render(self, symbol, size):
+        path = self._piece_files().get(symbol)
+        try:
+            if path and path.endswith(".svg"):
+                return self._from_svg(path, size)
+            if path:
+                return self._from_png(path, size)
+            return self._from_glyph(symbol, size)
+        except (ImportError, OSError, tkinter.TclError):
+            return None
+
+    @staticmethod
+    def _from_svg(path, size):
+        import cairosvg
+
+        png = cairosvg.svg2png(url=path, output_width=size, output_height=size)
+        return tkinter.PhotoImage(data=base64.b64encode(png))
+
+    @staticmethod
+    def _from_png(path, size):
+        try:
+            from PIL import Image, ImageTk
+        except ImportError:
+            # Tk only scales by whole factors: zoom then subsample to get close to the size
+            image = tkinter.PhotoImage(file=path)
+            scale = Fraction(size, image.width()).limit_denominator(8)
+            if scale.numerator > 1:
+                image = image.zoom(scale.numerator)
+            if scale.denominator > 1:
+                image = image.subsample(scale.denominator)
+            return image
+        with Image.open(path) as image:
+            return ImageTk.PhotoImage(image.convert("RGBA").resize((size, size), Image.LANCZOS))
+
+    @staticmethod
+    def _from_glyph(symbol, size):
+        from PIL import Image, ImageDraw, ImageFont, ImageTk
+
+        font = None
+        for name in GLYPH_FONTS:
+            try:
+                font = ImageFont.truetype(name, int(size * 0.8))
+                break
+            except OSError:
+                continue
+        if font is None:
+            raise OSError("no font with chess pieces found")
+
+        piece = chess.Piece.from_symbol(symbol)
+        image = Image.new("RGBA", (size, size))
+        ImageDraw.Draw(image).text(
+            (size / 2, size / 2),
+            get_piece_symbol(piece),
+            font=font,
+            anchor="mm",
+            fill="#ffffff" if piece.color == chess.WHITE else "#000000",
+            # Outline white pieces so they stand out on the light squares
+            stroke_width=max(1, size // 40) if piece.color == chess.WHITE else 0,
+            stroke_fill="#000000"
+        )
+        return ImageTk.PhotoImage(image)
+
+
+piece_sprites = PieceSprites()
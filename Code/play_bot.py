@@ -1,60 +1,39 @@
 import chess
 import chess.engine
+import chess.pgn
 import customtkinter as ctk
-from utils import get_piece_symbol
-from Code.analysis import display_chess_board  # Import the analysis function
+from engine_pool import engine_pool
+from engine_registry import engine_registry
+from board_canvas import BoardCanvas
+from move_list import MoveList
+from position_index import PositionIndex
+from tablebase import tablebases
 import io
 from tkinter import Listbox  # Add Listbox for move selection
 
 
-def play_bot_game():
-    """Start a game against a bot."""
-    root = ctk.CTk()
-    root.title("Play Against Bot")
-    root.geometry("1000x800")
+def play_bot_game(parent, on_back, on_analysis):
+    """Build the play-against-bot screen inside `parent`.
 
+    on_back() leaves the screen; on_analysis(game) opens a game on the analysis board.
+    """
     board = chess.Board()
-    engines = {
-        "Stockfish": "../engines/Stockfish17.exe",
-        "Komodo Dragon": "../engines/KomodoDragon3.3.exe",
-        "Houdini": "../engines/Houdini.exe",
-        "Obsidian": "../engines/Obsidian.exe",
-    }
-    engine_path = engines["Stockfish"]
+    bot_name = engine_registry.default
+    engine_path = engine_registry.path(bot_name)
+    engine_options = engine_registry.options(bot_name)
     game_started = False
     selected_square = None
     hover_square = None
+    position_index = PositionIndex()
+    viewed_ply = None  # ply shown while browsing the move list, None for the live position
+
+    def shown_board():
+        if viewed_ply is None:
+            return board
+        return position_index.board_at(viewed_ply)
 
     def draw_board():
-        canvas.delete("all")
-        square_size = 80
-        for row in range(8):
-            for col in range(8):
-                x1, y1 = col * square_size, row * square_size
-                x2, y2 = x1 + square_size, y1 + square_size
-                square = chess.square(col, 7 - row)
-
-                # Determine square color
-                color = "#e9edcc" if (row + col) % 2 == 0 else "#779556"
-                if square == selected_square:
-                    color = "#f7f769"  # Bright yellow for selected square
-                elif square == hover_square:
-                    color = "#baca44" if (row + col) % 2 == 0 else "#8fb344"  # Green for hover
-
-                canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="")
-
-                # Draw piece if present
-                piece = board.piece_at(square)
-                if piece:
-                    piece_symbol = get_piece_symbol(piece)
-                    text_color = "#ffffff" if piece.color == chess.WHITE else "#000000"
-                    canvas.create_text(
-                        x1 + square_size // 2,
-                        y1 + square_size // 2,
-                        text=piece_symbol,
-                        font=("Segoe UI", int(square_size * 0.6), "bold"),
-                        fill=text_color
-                    )
+        board_view.update(shown_board(), selected=selected_square, hover=hover_square)
         update_turn_indicator()
 
     def update_turn_indicator():
@@ -72,62 +51,59 @@ def play_bot_game():
             turn_frame.configure(fg_color="#1f538d" if board.turn else "#333333")  # Blue for white, dark for black
 
     def on_square_click(event):
-        nonlocal selected_square
+        nonlocal selected_square, viewed_ply
         if not game_started:
             update_status("Press 'Start Game' to begin.")
             return
+        if viewed_ply is not None:
+            # Clicking the board while browsing returns to the live position
+            viewed_ply = None
+            draw_board()
+            return
 
-        square_size = 80
-        col, row = event.x // square_size, 7 - (event.y // square_size)
-        square = chess.square(col, row)
+        square = board_view.square_at(event.x, event.y)
+        if square is None:
+            return
         if selected_square is None:
             if board.piece_at(square) and board.piece_at(square).color == chess.WHITE:
                 selected_square = square
         else:
             move = chess.Move(selected_square, square)
             if move in board.legal_moves:
+                position_index.append(move)
                 board.push(move)
                 draw_board()
                 update_pgn()
                 selected_square = None
-                root.after(500, bot_move)
+                parent.after(500, bot_move)
             else:
                 selected_square = None
         draw_board()
 
     def on_square_hover(event):
         nonlocal hover_square
-        square_size = 80
-        col, row = event.x // square_size, 7 - (event.y // square_size)
-        square = chess.square(col, row)
+        square = board_view.square_at(event.x, event.y)
         if hover_square != square:
             hover_square = square
-            draw_board()
+            board_view.update(shown_board(), selected=selected_square, hover=hover_square)
 
     def bot_move():
-        with chess.engine.SimpleEngine.popen_uci(engine_path) as engine:
-            result = engine.play(board, chess.engine.Limit(time=1.0))
-            board.push(result.move)
-            draw_board()
-            update_pgn()
+        # Tablebase endgames are played instantly and perfectly, without asking the engine
+        probe = tablebases.probe(board)
+        if probe is not None and probe.move is not None:
+            move = probe.move
+        else:
+            with engine_pool.engine(engine_path, engine_options) as engine:
+                move = engine.play(board, chess.engine.Limit(time=1.0)).move
+        position_index.append(move)
+        board.push(move)
+        draw_board()
+        update_pgn()
 
     def update_pgn():
-        white_moves_listbox.delete(0, "end")
-        black_moves_listbox.delete(0, "end")
-        game = chess.pgn.Game()
-        node = game
-        board_copy = chess.Board()
-        for i, move in enumerate(board.move_stack):
-            node = node.add_variation(move)
-            move_text = board_copy.san(move)
-            if i % 2 == 0:
-                white_moves_listbox.insert("end", f"{(i // 2) + 1}. {move_text}")
-            else:
-                black_moves_listbox.insert("end", move_text)
-            board_copy.push(move)
-        if white_moves_listbox.size() > 0 or black_moves_listbox.size() > 0:
-            highlight_selected_move(len(board.move_stack) - 1)
-        return str(game)
+        # SAN comes from the position index, so only the new move is inserted
+        move_list.sync(position_index.sans)
+        highlight_selected_move(len(position_index) - 1)
 
     def on_pgn_select(event):
         selected_index = (
@@ -140,18 +116,11 @@ def play_bot_game():
             go_to_move(move_index)
 
     def highlight_selected_move(move_index):
-        white_moves_listbox.selection_clear(0, "end")
-        black_moves_listbox.selection_clear(0, "end")
-        if move_index % 2 == 0:
-            white_moves_listbox.selection_set(move_index // 2)
-        else:
-            black_moves_listbox.selection_set(move_index // 2)
+        move_list.select(move_index)
 
     def go_to_move(move_index):
-        nonlocal board
-        board = chess.Board()
-        for i, move in enumerate(board.move_stack[:move_index + 1]):
-            board.push(move)
+        nonlocal viewed_ply
+        viewed_ply = move_index + 1 if move_index + 1 < len(position_index) else None
         draw_board()
         highlight_selected_move(move_index)
 
@@ -172,9 +141,11 @@ def play_bot_game():
         analysis_button.pack(pady=(10, 10))  # Show the analysis button after the game ends
 
     def reset_game():
-        nonlocal game_started, board, selected_square, hover_square
+        nonlocal game_started, board, selected_square, hover_square, position_index, viewed_ply
         game_started = False
         board = chess.Board()
+        position_index = PositionIndex()
+        viewed_ply = None
         selected_square = None
         hover_square = None
         bot_menu.configure(state="normal")
@@ -183,40 +154,31 @@ def play_bot_game():
         draw_board()
         update_pgn()
 
-    def on_bot_selection(bot_name):
-        nonlocal engine_path
-        engine_path = engines[bot_name]
+    def on_bot_selection(name):
+        nonlocal bot_name, engine_path, engine_options
+        bot_name = name
+        engine_path = engine_registry.path(bot_name)
+        engine_options = engine_registry.options(bot_name)
+        engine_pool.prewarm(engine_path, engine_options)
         bot_label.configure(text=f"Current Bot: {bot_name}")
 
     def update_status(message):
         status_label.configure(text=message)
 
     def go_to_analysis():
-        """Open the analysis board with the current game's PGN."""
-        pgn = update_pgn()  # Get the PGN of the current game
+        """Open the analysis board with the current game."""
         try:
-            import io
-            pgn_io = io.StringIO(pgn)
-            game = chess.pgn.read_game(pgn_io)  # Parse the PGN
-            if game is None:
-                raise ValueError("Invalid PGN format")
-            root.destroy()  # Close the current window
-            from Code.gui import ModernChessGUI
-            root_analysis = ctk.CTk()
-            root_analysis.title("Chess Analysis")
-            gui = ModernChessGUI(root_analysis, position=chess.STARTING_FEN)
-            gui.load_pgn(pgn)  # Load the PGN into the analysis board
-            root_analysis.mainloop()
+            on_analysis(chess.pgn.Game.from_board(board))
         except Exception as e:
             update_status(f"Error: {str(e)}")  # Display error message in the status label
 
     def confirm_back():
-        confirm_window = ctk.CTkToplevel(root)
+        confirm_window = ctk.CTkToplevel(parent)
         confirm_window.title("Confirm")
         confirm_window.geometry("300x150")
 
         # Center the dialog over the main tab
-        confirm_window.transient(root)
+        confirm_window.transient(parent)
         confirm_window.grab_set()
 
         label = ctk.CTkLabel(confirm_window, text="Are you sure you want to go back?", font=("Segoe UI", 14))
@@ -224,9 +186,7 @@ def play_bot_game():
 
         def go_back():
             confirm_window.destroy()
-            root.destroy()
-            from Code.main_menu import main_menu
-            main_menu()
+            on_back()
 
         yes_button = ctk.CTkButton(confirm_window, text="Yes", command=go_back)
         yes_button.pack(side="left", padx=20, pady=10)
@@ -235,7 +195,7 @@ def play_bot_game():
         no_button.pack(side="right", padx=20, pady=10)
 
     # Main layout
-    main_frame = ctk.CTkFrame(root)
+    main_frame = ctk.CTkFrame(parent)
     main_frame.pack(fill="both", expand=True, padx=20, pady=20)
 
     # Board section
@@ -243,6 +203,7 @@ def play_bot_game():
     board_frame.pack(side="left", padx=10, pady=10)
     canvas = ctk.CTkCanvas(board_frame, width=640, height=640, bg="#2b2b2b", highlightthickness=0)
     canvas.pack(fill="both", expand=True)
+    board_view = BoardCanvas(canvas, square_size=80, show_coordinates=False)
     canvas.bind("<Button-1>", on_square_click)
     canvas.bind("<Motion>", on_square_hover)
 
@@ -256,16 +217,16 @@ def play_bot_game():
     side_frame = ctk.CTkFrame(main_frame, width=300)
     side_frame.pack(side="right", fill="y", padx=10, pady=10)
 
-    bot_label = ctk.CTkLabel(side_frame, text="Current Bot: Stockfish", font=("Segoe UI", 16, "bold"))
+    bot_label = ctk.CTkLabel(side_frame, text=f"Current Bot: {bot_name}", font=("Segoe UI", 16, "bold"))
     bot_label.pack(pady=(10, 20))
 
     bot_menu = ctk.CTkOptionMenu(
         side_frame,
-        values=list(engines.keys()),
+        values=engine_registry.names,
         command=on_bot_selection,
         width=200
     )
-    bot_menu.set("Stockfish")
+    bot_menu.set(bot_name)
     bot_menu.pack(pady=(0, 20))
 
     start_button = ctk.CTkButton(side_frame, text="Start Game", command=start_game)
@@ -322,6 +283,7 @@ def play_bot_game():
         fg="white"
     )
     black_moves_listbox.grid(row=0, column=1, sticky="nsew", padx=(5, 0))
+    move_list = MoveList(white_moves_listbox, black_moves_listbox)
 
     white_moves_listbox.bind("<<ListboxSelect>>", on_pgn_select)
     black_moves_listbox.bind("<<ListboxSelect>>", on_pgn_select)
@@ -337,6 +299,6 @@ def play_bot_game():
     )
     back_button.pack(side="bottom", pady=10)
 
+    engine_pool.prewarm(engine_path, engine_options)
     draw_board()
-    root.mainloop()
 
@@ -0,0 +1,47 @@
+import chess
+
+
+class PositionIndex:
+    """Ply-indexed view of a game's mainline for constant-time navigation.
+
+    Every `checkpoint_every` plies a board snapshot is kept, so board_at()
+    replays at most that many moves whatever the game length. SAN is worked
+    out once when a move is appended. Snapshots keep their move stack, so a board handed out knows every move
+    of the game: engines and is_repetition() see the full history.
+    """
+
+    def __init__(self, board=None, game=None, checkpoint_every=16):
+        board = board.copy() if board is not None else chess.Board()
+        self.checkpoint_every = checkpoint_every
+        self.moves = []
+        self.sans = []
+        self.nodes = [game]  # game node after n plies, when built from a game
+        self._checkpoints = [board.copy()]
+        self._tip = board  # position after the last move
+
+    @classmethod
+    def from_game(cls, game, checkpoint_every=16):
+        index = cls(game.board(), game, checkpoint_every)
+        for node in game.mainline():
+            index.append(node.move, node)
+        return index
+
+    def __len__(self):
+        return len(self.moves)
+
+    def append(self, move, node=None):
+        self.sans.append(self._tip.san(move))
+        self.moves.append(move)
+        self.nodes.append(node)
+        self._tip.push(move)
+        if len(self.moves) % self.checkpoint_every == 0:
+            self._checkpoints.append(self._tip.copy())
+
+    def board_at(self, ply):
+        """Position after `ply` half-moves (0 is the starting position)."""
+        ply = max(0, min(ply, len(self.moves)))
+        checkpoint = ply // self.checkpoint_every
+        board = self._checkpoints[checkpoint].copy()
+        for move in self.moves[checkpoint * self.checkpoint_every:ply]:
+            board.push(move)
+        return board
@@ -0,0 +1,230 @@
+import bisect
+import hashlib
+import heapq
+import mmap
+import os
+import shutil
+import struct
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import chess
+import chess.pgn
+
+from eval_cache import CACHE_DIR
+
+MAGIC = b"CTPOSIDX"
+HEADER = struct.Struct("<8sQ")  # magic, number of entries
+RECORD = struct.Struct("<QI")  # position key, game number
+POSITION = struct.Struct("<8QBB")
+READ_RECORDS = 65536
+
+
+def position_key(board):
+    """64-bit key of a position: pieces, side to move, castling and en passant.
+
+    Plays the role of a Zobrist hash but costs a tenth of
+    chess.polyglot.zobrist_hash, which dominates building the index otherwise.
+    """
+    ep_square = board.ep_square if board.ep_square is not None and board.has_legal_en_passant() else 64
+    data = POSITION.pack(
+        board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings,
+        board.occupied_co[chess.WHITE], board.clean_castling_rights(), ep_square, board.turn
+    )
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+class PositionCollector(chess.pgn.BaseVisitor):
+    """PGN visitor that only keeps the key of every mainline position."""
+
+    def begin_game(self):
+        self.keys = set()
+
+    def begin_variation(self):
+        return chess.pgn.SKIP
+
+    def visit_board(self, board):
+        self.keys.add(position_key(board))
+
+    def result(self):
+        return self.keys
+
+
+def index_chunk(path, first_number, offset, count, run_path):
+    """Key the positions of `count` games starting at `offset` into a sorted run file.
+
+    Runs in a worker process; returns the number of records written.
+    """
+    records = []
+    with open(path, encoding="utf-8-sig", errors="replace") as f:
+        f.seek(offset)
+        for number in range(first_number, first_number + count):
+            keys = chess.pgn.read_game(f, Visitor=PositionCollector)
+            if keys is None:
+                break
+            records.extend((key, number) for key in keys)
+    records.sort()
+    with open(run_path, "wb") as f:
+        for start in range(0, len(records), READ_RECORDS):
+            f.write(b"".join(RECORD.pack(*record) for record in records[start:start + READ_RECORDS]))
+    return len(records)
+
+
+def _read_run(run_path):
+    with open(run_path, "rb") as f:
+        while True:
+            data = f.read(RECORD.size * READ_RECORDS)
+            if not data:
+                return
+            yield from RECORD.iter_unpack(data)
+
+
+class PositionSearch:
+    """On-disk index from position to the games of a PgnDatabase that reach it.
+
+    The index is a file of sorted position keys followed by the matching game
+    numbers. It is memory-mapped, so a lookup is a binary search over the
+    keys however many games the database holds. Building it parses the games
+    in chunks on a pool of processes, each writing a sorted run, and merges the
+    runs into the final file.
+    """
+
+    def __init__(self, database, workers=None, chunk_games=2000):
+        self.database = database
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_games = chunk_games
+        self.path = os.path.join(CACHE_DIR, f"positions-{self._file_key()}.idx")
+
+        self.progress = (0, 0)  # (chunks done, chunks) while building
+        self.error = None
+        self.built = threading.Event()
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._mmap = None
+        self._view = None
+        self._keys = None
+        self._games = None
+
+    def _file_key(self):
+        # Rebuild whenever the database file changes
+        stat = os.stat(self.database.path)
+        text = f"{os.path.abspath(self.database.path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+    @property
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def start(self):
+        """Open the index, building it first in the background if needed."""
+        threading.Thread(target=self._build_or_open, daemon=True).start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _build_or_open(self):
+        try:
+            if not self.exists:
+                self.build()
+            if not self._cancelled.is_set():
+                self.open()
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.built.set()
+
+    def build(self):
+        self.database.indexed.wait()
+        if self.database.error:
+            raise ValueError(self.database.error)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+
+        total = len(self.database)
+        chunks = range(0, total, self.chunk_games)
+        self.progress = (0, len(chunks))
+        runs = []
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = []
+                for first in chunks:
+                    run_path = f"{self.path}.run{len(runs)}"
+                    runs.append(run_path)
+                    futures.append(executor.submit(
+                        index_chunk, self.database.path, first, self.database.offset(first),
+                        min(self.chunk_games, total - first), run_path
+                    ))
+                count = 0
+                for done, future in enumerate(as_completed(futures), 1):
+                    if self._cancelled.is_set():
+                        for pending in futures:
+                            pending.cancel()
+                        return
+                    count += future.result()
+                    self.progress = (done, len(chunks))
+            self._merge(runs, count)
+        finally:
+            for run_path in runs:
+                if os.path.exists(run_path):
+                    os.remove(run_path)
+
+    def _merge(self, runs, count):
+        # Keys and game numbers go to separate sections so the keys can be bisected directly
+        keys_path = self.path + ".keys"
+        games_path = self.path + ".games"
+        try:
+            with open(keys_path, "wb") as keys_file, open(games_path, "wb") as games_file:
+                keys_file.write(HEADER.pack(MAGIC, count))
+                keys, games = array("Q"), array("I")
+                for key, number in heapq.merge(*(_read_run(run) for run in runs)):
+                    keys.append(key)
+                    games.append(number)
+                    if len(keys) == READ_RECORDS:
+                        keys.tofile(keys_file)
+                        games.tofile(games_file)
+                        keys, games = array("Q"), array("I")
+                keys.tofile(keys_file)
+                games.tofile(games_file)
+            with open(keys_path, "ab") as keys_file, open(games_path, "rb") as games_file:
+                shutil.copyfileobj(games_file, keys_file)
+            os.replace(keys_path, self.path)
+        finally:
+            for path in (keys_path, games_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def open(self):
+        with open(self.path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = HEADER.unpack_from(mapped)
+        if magic != MAGIC:
+            mapped.close()
+            raise ValueError(f"Not a position index: {self.path}")
+        view = memoryview(mapped)
+        keys_end = HEADER.size + 8 * count
+        with self._lock:
+            self._mmap = mapped
+            self._view = view
+            self._keys = view[HEADER.size:keys_end].cast("Q")
+            self._games = view[keys_end:keys_end + 4 * count].cast("I")
+
+    def find(self, board, limit=None):
+        """Numbers of the games that reach the position on `board`, in file order."""
+        key = position_key(board)
+        with self._lock:
+            if self._keys is None:
+                return []
+            start = bisect.bisect_left(self._keys, key)
+            end = bisect.bisect_right(self._keys, key, start)
+            if limit is not None:
+                end = min(end, start + limit)
+            return list(self._games[start:end])
+
+    def close(self):
+        self.cancel()
+        with self._lock:
+            if self._mmap is not None:
+                for view in (self._keys, self._games, self._view):
+                    view.release()
+                self._mmap.close()
+                self._mmap = self._view = self._keys = self._games = None
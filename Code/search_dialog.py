@@ -0,0 +1,116 @@
+import customtkinter as ctk
+from tkinter import Listbox
+
+from export_dialog import BulkExportDialog
+from pgn_export import database_chunks
+
+# Games listed at most
+MAX_RESULTS = 1000
+
+
+class SearchDialog:
+    """Lists the games of the open database that reach a position."""
+
+    def __init__(self, parent, position_search, board, callback):
+        self.window = ctk.CTkToplevel(parent)
+        self.window.title("Games With This Position")
+        self.window.geometry("600x400")
+        self.position_search = position_search
+        self.database = position_search.database
+        self.board = board.copy(stack=False)
+        self.callback = callback  # Called with the chosen chess.pgn.Game
+        self.results = []
+        self.window.transient(parent)
+
+        self.main_container = ctk.CTkFrame(self.window, fg_color="transparent")
+        self.main_container.pack(fill="both", expand=True, padx=20, pady=20)
+
+        self.status_label = ctk.CTkLabel(
+            self.main_container,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=14, weight="bold")
+        )
+        self.status_label.pack(pady=(0, 10), anchor="w")
+
+        self.game_listbox = Listbox(
+            self.main_container,
+            font=("Segoe UI", 11),
+            selectmode="single",
+            exportselection=False,
+            bg="#2b2b2b",
+            fg="white"
+        )
+        self.game_listbox.pack(fill="both", expand=True)
+        self.game_listbox.bind("<Double-Button-1>", lambda event: self.open_selected_game())
+
+        button_frame = ctk.CTkFrame(self.main_container, fg_color="transparent")
+        button_frame.pack(fill="x", pady=(10, 0))
+
+        open_button = ctk.CTkButton(
+            button_frame,
+            text="Open Game",
+            width=120,
+            command=self.open_selected_game
+        )
+        open_button.pack(side="left", padx=(0, 10))
+
+        export_button = ctk.CTkButton(
+            button_frame,
+            text="Export...",
+            width=120,
+            command=self.export_results
+        )
+        export_button.pack(side="left", padx=(0, 10))
+
+        close_button = ctk.CTkButton(
+            button_frame,
+            text="Close",
+            width=120,
+            command=self.window.destroy
+        )
+        close_button.pack(side="left")
+
+        self.poll_index()
+
+    def poll_index(self):
+        if not self.window.winfo_exists():
+            return
+        if not self.position_search.built.is_set():
+            done, total = self.position_search.progress
+            self.status_label.configure(text=f"Building position index... {done}/{total}")
+            self.window.after(500, self.poll_index)
+            return
+        if self.position_search.error:
+            self.status_label.configure(text=f"Error: {self.position_search.error}")
+            return
+        self.show_results()
+
+    def show_results(self):
+        self.results = self.position_search.find(self.board, limit=MAX_RESULTS + 1)
+        if len(self.results) > MAX_RESULTS:
+            self.results = self.results[:MAX_RESULTS]
+            self.status_label.configure(text=f"More than {MAX_RESULTS:,} games (showing the first)")
+        else:
+            self.status_label.configure(text=f"{len(self.results):,} games")
+        for number in self.results:
+            headers = self.database.read_headers(number)
+            self.game_listbox.insert(
+                "end",
+                f"{number + 1}. {headers.get('White', '?')} - {headers.get('Black', '?')}  "
+                f"{headers.get('Result', '*')}  {headers.get('Date', '')}"
+            )
+
+    def export_results(self):
+        # Every matching game, not only the ones listed
+        numbers = self.position_search.find(self.board)
+        if numbers:
+            BulkExportDialog(self.window, database_chunks(self.database, numbers), len(numbers))
+
+    def open_selected_game(self):
+        selection = self.game_listbox.curselection()
+        if not selection:
+            return
+        game = self.database.game(self.results[selection[0]])
+        if game is not None:
+            self.callback(game)
+        self.window.destroy()
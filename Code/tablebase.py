@@ -0,0 +1,154 @@
+import atexit
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+import chess
+import chess.engine
+import chess.polyglot
+import chess.syzygy
+
+# Syzygy .rtbw/.rtbz files found here are used by the analysis board and the bot
+TABLEBASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tablebases")
+
+# Centipawns a tablebase win is shown as: above any engine evaluation, below mate scores
+TB_WIN_SCORE = 20000
+
+# wdl: -2 loss, -1 blessed loss, 0 draw, 1 cursed win, 2 win, for the side to move.
+# dtz: plies to the next capture or pawn move under best play, None without DTZ tables.
+# move: a move that keeps the result, None when there is no legal move.
+TablebaseProbe = namedtuple("TablebaseProbe", "wdl dtz move")
+
+
+class Tablebases:
+    """Syzygy tablebase probes with an LRU of results.
+
+    Tables are opened on the first probe, so an empty or missing directory
+    costs nothing. Positions with more pieces than the largest table are
+    rejected before touching the tables at all.
+    """
+
+    def __init__(self, path=TABLEBASE_DIR, max_entries=10000):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_pieces = 0
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # zobrist -> TablebaseProbe or None
+        self._tables = None
+        self._opened = False
+
+    def _open(self):
+        # Caller holds self._lock
+        if not self._opened:
+            self._opened = True
+            if self.path and os.path.isdir(self.path):
+                tables = chess.syzygy.Tablebase()
+                if tables.add_directory(self.path):
+                    self._tables = tables
+                    # Table names look like KQvKR: one letter per piece plus the "v"
+                    self.max_pieces = max(len(name) - 1 for name in tables.wdl)
+                else:
+                    tables.close()
+        return self._tables
+
+    @property
+    def available(self):
+        with self._lock:
+            return self._open() is not None
+
+    def covers(self, board):
+        return (self.available and not board.castling_rights
+                and chess.popcount(board.occupied) <= self.max_pieces)
+
+    def probe(self, board):
+        """TablebaseProbe for `board`, or None if it is not in the tables."""
+        if not self.covers(board):
+            return None
+        key = chess.polyglot.zobrist_hash(board)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            probe = self._probe(board)
+            self._entries[key] = probe
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return probe
+
+    def _probe(self, board):
+        # Caller holds self._lock
+        try:
+            wdl = self._tables.probe_wdl(board)
+        except KeyError:
+            return None  # Missing table
+        dtz = self._tables.get_dtz(board)
+
+        best_move = None
+        best_rank = None
+        for move in board.legal_moves:
+            rank = self._rank(board, move)
+            if rank is not None and (best_rank is None or rank > best_rank):
+                best_move, best_rank = move, rank
+        return TablebaseProbe(wdl, dtz, best_move)
+
+    def _rank(self, board, move):
+        # Higher is better for the side to move: the result first, then the fastest
+        # conversion of a win or the slowest of a loss
+        zeroing = board.is_zeroing(move)
+        board.push(move)
+        try:
+            if board.is_checkmate():
+                return (3, 0)
+            wdl = self._tables.get_wdl(board)
+            if wdl is None:
+                return None  # Leads into a table that is not available
+            dtz = None if zeroing else self._tables.get_dtz(board)
+        finally:
+            board.pop()
+        outcome = -wdl
+        plies = abs(dtz) + 1 if dtz is not None else 1
+        return (outcome, -plies if outcome > 0 else plies)
+
+    def wdl(self, board):
+        """WDL of `board` alone, without the move search a full probe does."""
+        if not self.covers(board):
+            return None
+        with self._lock:
+            probe = self._entries.get(chess.polyglot.zobrist_hash(board))
+            if probe is not None:
+                return probe.wdl
+            return self._tables.get_wdl(board)
+
+    def result(self, board):
+        """Game result of a position in the tables, otherwise None."""
+        wdl = self.wdl(board)
+        if wdl is None:
+            return None
+        if wdl in (-1, 0, 1):
+            return "1/2-1/2"  # Cursed wins and blessed losses are draws under the 50-move rule
+        side_wins = wdl > 0
+        return "1-0" if side_wins == (board.turn == chess.WHITE) else "0-1"
+
+    @staticmethod
+    def score(probe, turn):
+        """The probe as a PovScore, so it can be shown like an engine evaluation."""
+        if probe.wdl == 2:
+            score = chess.engine.Cp(TB_WIN_SCORE)
+        elif probe.wdl == -2:
+            score = chess.engine.Cp(-TB_WIN_SCORE)
+        else:
+            score = chess.engine.Cp(0)
+        return chess.engine.PovScore(score, turn)
+
+    def close(self):
+        with self._lock:
+            if self._tables is not None:
+                self._tables.close()
+                self._tables = None
+            self._entries.clear()
+            self._opened = False
+
+
+tablebases = Tablebases()
+atexit.register(tablebases.close)
@@ -0,0 +1,273 @@
+import itertools
+import math
+import threading
+
+from match_runner import MatchRunner, format_stats
+
+ROUND_ROBIN = "round-robin"
+GAUNTLET = "gauntlet"
+
+
+def expected_score(elo):
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_to_elo(score):
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return 400 * math.log10(score / (1 - score))
+
+
+def format_elo(elo, error):
+    # A 100% or 0% score has an infinite Elo and no meaningful margin
+    if math.isfinite(elo) and math.isfinite(error):
+        return f"{elo:+.1f} ± {error:.1f}"
+    return f"{elo:+.1f}"
+
+
+# Added to every empty outcome bin before the SPRT, as fishtest does, so a pairing in which
+# every game (or pair) ends the same way still has a variance and can reach a bound
+PSEUDO_COUNT = 1e-3
+
+
+def _mean_and_variance(counts, values):
+    n = sum(counts)
+    if n == 0:
+        return 0, 0.5, 0.0
+    mean = sum(count * value for count, value in zip(counts, values)) / n
+    variance = sum(count * (value - mean) ** 2 for count, value in zip(counts, values)) / n
+    return n, mean, variance
+
+
+class PairingStats:
+    """Results of one engine against another, seen from the first engine.
+
+    Games n and n + 1 (n odd) are the same pairing with colours reversed, so
+    they also form the game pairs used for pentanomial statistics.
+    """
+
+    def __init__(self, engine1, engine2):
+        self.engine1 = engine1
+        self.engine2 = engine2
+        self.points = {}  # game_num -> points scored by engine1
+
+    def add(self, game_num, points):
+        self.points[game_num] = points
+
+    @property
+    def games(self):
+        return len(self.points)
+
+    def trinomial(self):
+        """Counts of engine1 losses, draws and wins."""
+        counts = [0, 0, 0]
+        for points in self.points.values():
+            counts[int(points * 2)] += 1
+        return counts
+
+    def pentanomial(self):
+        """Counts of game pairs in which engine1 scored 0, 0.5, 1, 1.5 and 2 points."""
+        counts = [0, 0, 0, 0, 0]
+        for game_num, points in self.points.items():
+            if game_num % 2 == 1 and game_num + 1 in self.points:
+                counts[int((points + self.points[game_num + 1]) * 2)] += 1
+        return counts
+
+    def _score_distribution(self, regularize=False):
+        # Prefer game pairs: they cancel out most of the opening and colour bias
+        counts, values = self.pentanomial(), [0, 0.25, 0.5, 0.75, 1]
+        if not sum(counts):
+            counts, values = self.trinomial(), [0, 0.5, 1]
+        if regularize and sum(counts):
+            counts = [count or PSEUDO_COUNT for count in counts]
+        return _mean_and_variance(counts, values)
+
+    def elo(self):
+        """Elo difference for engine1 and its 95% error margin."""
+        n, mean, variance = self._score_distribution()
+        if n == 0:
+            return 0.0, math.inf
+        margin = 1.96 * math.sqrt(variance / n)
+        low = score_to_elo(max(mean - margin, 0))
+        high = score_to_elo(min(mean + margin, 1))
+        return score_to_elo(mean), (high - low) / 2
+
+    def llr(self, elo0, elo1):
+        """Log-likelihood ratio of H1 (elo1) against H0 (elo0), normal approximation."""
+        n, mean, variance = self._score_distribution(regularize=True)
+        if n == 0:
+            return 0.0
+        s0, s1 = expected_score(elo0), expected_score(elo1)
+        return n * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance)
+
+    def summary(self):
+        losses, draws, wins = self.trinomial()
+        return (
+            f"{self.engine1} vs {self.engine2}: +{wins} ={draws} -{losses}  "
+            f"Elo {format_elo(*self.elo())}  Penta {self.pentanomial()}"
+        )
+
+
+class SPRT:
+    """Sequential probability ratio test between two Elo hypotheses."""
+
+    def __init__(self, elo0=0.0, elo1=5.0, alpha=0.05, beta=0.05):
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+
+    def decision(self, stats):
+        """'H1' or 'H0' once the result is decided, otherwise None."""
+        llr = stats.llr(self.elo0, self.elo1)
+        if llr >= self.upper:
+            return "H1"
+        if llr <= self.lower:
+            return "H0"
+        return None
+
+    def summary(self, stats):
+        decision = self.decision(stats)
+        state = {"H1": "H1 accepted", "H0": "H0 accepted", None: "running"}[decision]
+        return (
+            f"SPRT [{self.elo0:g}, {self.elo1:g}] LLR {stats.llr(self.elo0, self.elo1):.2f} "
+            f"({self.lower:.2f}, {self.upper:.2f}) {state}"
+        )
+
+
+class Tournament:
+    """Round-robin or gauntlet over several engines, one MatchRunner per pairing.
+
+    With an SPRT a pairing is stopped as soon as its result is decided,
+    instead of always playing games_per_pairing games. `completed` maps
+    (engine1, engine2) to the results of games already played in an earlier
+    run, which are counted but not replayed.
+    """
+
+    def __init__(self, engines, mode=ROUND_ROBIN, gauntlet_engine=None, games_per_pairing=10,
+                 time_per_move=1.0, concurrency=1, sprt=None, time_control=None, adjudicator=None,
+                 options=None, openings=None, on_move=None, on_game_finished=None, completed=None):
+        self.engines = dict(engines)  # name -> path
+        self.mode = mode
+        self.gauntlet_engine = gauntlet_engine or next(iter(self.engines))
+        self.games_per_pairing = games_per_pairing
+        self.time_per_move = time_per_move
+        self.concurrency = concurrency
+        self.sprt = sprt
+        self.time_control = time_control
+        self.adjudicator = adjudicator
+        self.options = options  # name -> UCI options
+        self.openings = openings
+        self.on_move = on_move
+        self.on_game_finished = on_game_finished
+        self.completed = completed or {}
+
+        self.results = {}  # (engine1, engine2) -> PairingStats
+        self.games = []
+        self.stats = {"startup": 0.0, "search": 0.0}
+        self.current_runner = None
+        self._stop = threading.Event()
+
+    def pairings(self):
+        names = list(self.engines)
+        if self.mode == GAUNTLET:
+            return [(self.gauntlet_engine, name) for name in names if name != self.gauntlet_engine]
+        return list(itertools.combinations(names, 2))
+
+    def stop(self):
+        self._stop.set()
+        if self.current_runner:
+            self.current_runner.stop()
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def run(self):
+        for engine1, engine2 in self.pairings():
+            if self.stopped:
+                break
+            self.play_pairing(engine1, engine2)
+
+    def play_pairing(self, engine1, engine2):
+        stats = PairingStats(engine1, engine2)
+        completed = self.completed.get((engine1, engine2), {})
+        for game_num, points in completed.items():
+            stats.add(game_num, points)
+        self.results[(engine1, engine2)] = stats
+        if self.sprt and self.sprt.decision(stats):
+            return
+
+        def on_game_finished(game_num, game):
+            stats.add(game_num, MatchRunner.engine1_points(game_num, game))
+            self.games.append(game)
+            if self.sprt and self.sprt.decision(stats):
+                runner.stop()
+            if self.on_game_finished:
+                self.on_game_finished(stats, game_num, game)
+
+        runner = MatchRunner(
+            engine1, self.engines[engine1],
+            engine2, self.engines[engine2],
+            num_games=self.games_per_pairing,
+            time_per_move=self.time_per_move,
+            concurrency=self.concurrency,
+            time_control=self.time_control,
+            adjudicator=self.adjudicator,
+            options=self.options,
+            openings=self.openings,
+            on_move=self.on_move,
+            on_game_finished=on_game_finished,
+            completed=completed
+        )
+        self.current_runner = runner
+        if self.stopped:
+            return
+        try:
+            runner.run()
+        finally:
+            for name, seconds in runner.stats.items():
+                self.stats[name] += seconds
+
+    def standings(self):
+        """(name, points, games) for every engine, best first."""
+        table = {name: [0.0, 0] for name in self.engines}
+        for (engine1, engine2), stats in self.results.items():
+            points = sum(stats.points.values())
+            table[engine1][0] += points
+            table[engine1][1] += stats.games
+            table[engine2][0] += stats.games - points
+            table[engine2][1] += stats.games
+        return sorted(((name, points, games) for name, (points, games) in table.items()),
+                      key=lambda row: row[1], reverse=True)
+
+    def crosstable(self):
+        names = [name for name, _, _ in self.standings()]
+        width = max(len(name) for name in names) + 2
+        lines = ["".ljust(width) + "".join(name[:8].rjust(10) for name in names)]
+        for row in names:
+            cells = []
+            for column in names:
+                stats = self.results.get((row, column))
+                flipped = self.results.get((column, row))
+                if stats and stats.games:
+                    cells.append(f"{sum(stats.points.values()):g}/{stats.games}")
+                elif flipped and flipped.games:
+                    cells.append(f"{flipped.games - sum(flipped.points.values()):g}/{flipped.games}")
+                else:
+                    cells.append("-")
+            lines.append(row.ljust(width) + "".join(cell.rjust(10) for cell in cells))
+        return "\n".join(lines)
+
+    def report(self):
+        lines = [self.crosstable(), ""]
+        for stats in self.results.values():
+            lines.append(stats.summary())
+            if self.sprt:
+                lines.append("  " + self.sprt.summary(stats))
+        return "\n".join(lines)
+
+    def stats_summary(self):
+        return format_stats(self.stats)